@@ -3,33 +3,111 @@ Agent 2: Resume Customizer
 Reads jobs from Google Sheet, customizes resume for each job, generates cover letters
 """
 
+import argparse
 import os
-import json
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from openai import OpenAI
-from docx import Document
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import requests
-from bs4 import BeautifulSoup
+import threading
 import time
-from datetime import datetime
+from collections import Counter
+from contextlib import contextmanager
+from http_client import TokenBucket, get_client
+from description_cache import DescriptionCache, job_id_from_url
+from description_extractor import DescriptionExtractor
+from sheet_repository import SheetRepository
+from job_record import JobRecord
+from pipeline import Pipeline
+from llm_cache import LLMCache
+from job_analysis import RESPONSE_FORMAT, SCORING_FIELDS, AnalysisStreamParser, JobAnalysis
+from resume_index import ResumeIndex, load_resume_index
+from match_scoring import score_many
+from semantic_index import SemanticMatcher, default_embedder
+from batch_analysis import OpenAIBatchRunner, RecordedBatchRunner, batch_request
+from docx_renderer import CoverLetterRenderer, cover_letter_paragraphs, load_resume_renderer
+from document_pool import DocumentRenderPool
+from run_journal import RunJournal, file_version, reached
+from prescreen import FitScreen
+from duplicate_index import DuplicateIndex
+
+# Bump a version whenever its prompt changes so old cached responses are not reused
+ANALYSIS_PROMPT_VERSION = 'analysis-v2'
+COVER_LETTER_PROMPT_VERSION = 'cover-letter-v1'
+
+ANALYSIS_INSTRUCTIONS = (
+    "Extract from the job posting: seniority level; the top 5 required skills (specific); "
+    "the top 5 keywords a resume should contain; the domain focus (e.g. B2B SaaS, Fintech, AI/ML); "
+    "and up to 5 key responsibilities. Keep each item short."
+)
 
 class ResumeCustomizer:
-    def __init__(self, master_resume_path="resume_master.docx", use_sheets=True):
+    def __init__(self, master_resume_path="resume_master.docx", use_sheets=True, cache_dir='.cache'):
         self.master_resume_path = master_resume_path
         self.use_sheets = use_sheets
+        self.cache_dir = cache_dir  # Description/LLM caches, vectors, journal and duplicate index
         self.sheet = None
+        self.sheet_repo = None
         self.anthropic_client = None
+        self.http = get_client()
+        self.description_cache = DescriptionCache(os.path.join(cache_dir, 'descriptions.sqlite3'))
+        self.extractor = DescriptionExtractor()
         
         # Load config
         self.config = {
             'min_match_score': 50,  # Minimum score to process
+            'min_semantic_fit': 0.10,  # Jobs less similar to the resume are skipped before any LLM call
             'auto_approve_score': 70,  # Auto-flag for Agent 3
-            'max_jobs_per_day': 20,
-            'output_folder': 'customized_resumes'
+            'max_jobs_per_day': 200,
+            'output_folder': 'customized_resumes',
+            # Concurrent workers per pipeline stage (see run)
+            'stage_workers': {
+                'describe': 4,
+                'screen': 2,
+                'analyze': 8,
+                'score': 2,
+                'letter': 8,
+                'render': os.cpu_count() or 2,  # Threads handing jobs to the render processes
+                'sync': 1,
+            },
+            'render_processes': os.cpu_count() or 2,  # Worker processes writing DOCX files
+            'max_concurrent_llm_calls': 8,
+            'llm_requests_per_second': 5.0,
+            'llm_model': 'gpt-4o-mini',  # Using GPT-4o-mini for cost efficiency
+            'analysis_retries': 1,  # Extra attempts when the analysis JSON is malformed
+            'llm_cache_ttl_days': 30,
+            'llm_cache_near_duplicates': True,  # Reuse analyses of reposted jobs
+            # Local sentence-transformers model for semantic fit (None: hashing vectorizer)
+            'semantic_model': None,
+            'batch_poll_seconds': 60,
+            'batch_record_path': os.path.join(cache_dir, 'last_batch_output.jsonl'),
         }
+        self.llm_cache = LLMCache(
+            os.path.join(cache_dir, 'llm_responses.sqlite3'), ttl_days=self.config['llm_cache_ttl_days']
+        )
+        self.semantic = SemanticMatcher(
+            master_resume_path, default_embedder(self.config['semantic_model']),
+            index_path=os.path.join(cache_dir, 'job_vectors')
+        )
+        self.prescreen = FitScreen(self.semantic, self.config['min_semantic_fit'])
+        self.cover_letter_renderer = CoverLetterRenderer()
+        self.documents = DocumentRenderPool(
+            master_resume_path, self.config['output_folder'], self.config['render_processes']
+        )
+        self.analysis_stats = Counter()
+        self._stats_lock = threading.Lock()
+        # Per-job progress, so a rerun resumes where the last one stopped (until the resume changes)
+        self.journal = RunJournal(
+            os.path.join(cache_dir, 'agent2_journal.sqlite3'), resume_version=file_version(master_resume_path)
+        )
+        # Reposts of a job analyzed before reuse its analysis (MinHash/LSH over job history)
+        self.duplicates = DuplicateIndex(os.path.join(cache_dir, 'duplicates.sqlite3'))
+        self._unsynced = []  # Job IDs queued for the sheet, checkpointed as synced on flush
+        
+        # Per-service limits replace the fixed sleep between jobs
+        self._llm_slots = threading.BoundedSemaphore(self.config['max_concurrent_llm_calls'])
+        self._llm_rate = TokenBucket(self.config['llm_requests_per_second'], capacity=8)
         
         if use_sheets:
             self._setup_google_sheets()
@@ -55,6 +133,7 @@ class ResumeCustomizer:
             client = gspread.authorize(creds)
             spreadsheet = client.open("LinkedIn PM Jobs")
             self.sheet = spreadsheet.sheet1
+            self.sheet_repo = SheetRepository(self.sheet)
             
             print("✅ Connected to Google Sheets")
             
@@ -82,43 +161,96 @@ class ResumeCustomizer:
             return []
         
         try:
-            all_data = self.sheet.get_all_records()
+            # Single snapshot per run; later status updates use its row index
+            self.sheet_repo.snapshot()
+            self.sheet_repo.save_index()
+            
+            # Finish the sheet sync of jobs a previous run rendered but never synced
+            reconciled = self.reconcile_checkpoints()
             
-            # Filter for jobs with status "New" (not yet processed by Agent 2)
+            # Jobs with status "New" (not yet processed by Agent 2), as compact JobRecords
             unprocessed = [
-                job for job in all_data 
-                if job.get('Status', '').lower() == 'new'
+                job for job in self.sheet_repo.job_records(status='new') if job.job_id not in reconciled
             ]
+            # A synced job showing New again was reset in the sheet: run it from the start
+            restarted = self.journal.restart(job.job_id for job in unprocessed if job.job_id)
+            if restarted:
+                print(f"📒 {restarted} jobs were reset to New in the sheet and will be redone")
             
             print(f"📋 Found {len(unprocessed)} jobs to process")
-            return unprocessed[:self.config['max_jobs_per_day']]
+            # Best expected matches first, so the daily cap spends LLM budget on them
+            return self.rank_jobs(unprocessed)[:self.config['max_jobs_per_day']]
             
         except Exception as e:
             print(f"❌ Error fetching jobs: {str(e)}")
             return []
     
-    def scrape_job_description(self, job_url):
-        """Scrape full job description from LinkedIn"""
+    def rank_jobs(self, jobs):
+        """
+        Order jobs by expected match score, highest first.
+        Jobs with a description in the sheet are first screened on semantic
+        fit (those below min_semantic_fit are dropped, so they don't take a
+        slot under the daily cap), then scored with their cached AI analysis
+        if there is one, else the basic analysis, with ties broken by fit.
+        Jobs without a description keep their sheet order after them and are
+        screened once their description is fetched.
+        """
+        scored, analyses = [], []
+        cached = 0
+        fits = {
+            i: self.prescreen.passes(job.job_id, job.description.strip())
+            for i, job in enumerate(jobs) if job.description.strip()
+        }
+        described = [i for i, (passed, _) in fits.items() if passed]
+        if len(described) < len(fits):
+            print(f"🧹 Skipped {len(fits) - len(described)} jobs below semantic fit {self.prescreen.threshold:.2f}")
+        # Semantic fit breaks ties between equal scores (score_many keeps input order on ties)
+        described.sort(key=lambda i: -fits[i][1])
+        for i in described:
+            description = jobs[i].description.strip()
+            analysis = self._cached_analysis(description, peek=True)
+            cached += analysis is not None
+            scored.append(i)
+            analyses.append(analysis or self._basic_analysis(description))
+        unscored = [i for i in range(len(jobs)) if i not in fits]
+        if not scored:
+            return [jobs[i] for i in unscored]
+        
+        ranked = score_many(analyses, load_resume_index(self.master_resume_path))
+        order = [scored[i] for i in ranked['index']]
+        print(f"📈 Ranked {len(scored)} jobs by expected match score ({cached} from cached AI analyses)")
+        return [jobs[i] for i in order + unscored]
+    
+    def scrape_job_description(self, job_url, job_id=None):
+        """Scrape full job description from LinkedIn (description cache first)"""
+        job_id = str(job_id) if job_id else job_id_from_url(job_url)
+        cached = self.description_cache.get(job_id) if job_id else None
+        if cached and cached['fresh'] and cached['text']:
+            print(f"   ✓ Using cached description ({len(cached['text'])} characters)")
+            return cached['text']
+        
         try:
             print(f"   Fetching job description...")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            headers = self.description_cache.conditional_headers(cached)
+            response = self.http.get(job_url, headers=headers, timeout=10)
             
-            response = requests.get(job_url, headers=headers, timeout=10)
+            if response.status_code == 304 and cached and cached['text']:
+                self.description_cache.touch(job_id)
+                print(f"   ✓ Cached description still current ({len(cached['text'])} characters)")
+                return cached['text']
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Try to find job description
-                description_div = soup.find('div', class_='description__text')
-                if not description_div:
-                    description_div = soup.find('div', class_='show-more-less-html__markup')
+                description, tier = self.extractor.extract_with_tier(response.text)
                 
-                if description_div:
-                    description = description_div.get_text(strip=True, separator='\n')
-                    print(f"   ✓ Fetched {len(description)} characters")
+                if description:
+                    print(f"   ✓ Fetched {len(description)} characters ({tier})")
+                    if job_id:
+                        self.description_cache.put(
+                            job_id, response.text, description,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified')
+                        )
                     return description
                 else:
                     print("   ⚠️  Could not find description")
@@ -132,98 +264,177 @@ class ResumeCustomizer:
             return None
     
     def analyze_job_with_ai(self, job_title, company, job_description):
-        """Use GPT to analyze job and extract key requirements"""
+        """
+        Use GPT to analyze job and extract key requirements.
+        The response is schema-constrained JSON consumed as a stream; once the
+        scoring fields have arrived, a job that cannot reach min_match_score
+        is cut off without waiting for the rest. Malformed output is retried
+        up to config['analysis_retries'] times before the basic analysis.
+        """
+        cached = self._cached_analysis(job_description)
+        if cached:
+            print("   ✓ AI analysis (cached)")
+            return cached
+        
         if not self.anthropic_client:
             print("   ⚠️  OpenAI API not configured, using basic analysis")
             return self._basic_analysis(job_description)
         
+        print("   Analyzing job with AI...")
+        started = time.perf_counter()
         try:
-            print("   Analyzing job with AI...")
-            
-            prompt = f"""Analyze this job posting and extract key information:
-
-Job Title: {job_title}
-Company: {company}
-
-Job Description:
-{job_description}
-
-Please provide:
-1. Top 5 required skills (be specific)
-2. Top 5 keywords to include in resume
-3. Key responsibilities
-4. Seniority level (Junior/Mid/Senior/Principal)
-5. Domain focus (e.g., B2B SaaS, Fintech, AI/ML, etc.)
-
-Format as JSON:
-{{
-  "required_skills": ["skill1", "skill2", ...],
-  "keywords": ["keyword1", "keyword2", ...],
-  "responsibilities": ["resp1", "resp2", ...],
-  "seniority": "Senior",
-  "domain": "B2B SaaS"
-}}
-"""
-            
-            response = self.anthropic_client.chat.completions.create(
-                model="gpt-4o-mini",  # Using GPT-4o-mini for cost efficiency
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1024,
-                temperature=0.7
-            )
-            
-            response_text = response.choices[0].message.content
+            return self._analyze_with_retries(job_title, company, job_description)
+        finally:
+            self._count('analyzed_jobs')
+            self._count('seconds', time.perf_counter() - started)
+    
+    def _analyze_with_retries(self, job_title, company, job_description):
+        """Streamed analysis, retried on malformed output, else the basic analysis"""
+        for attempt in range(self.config['analysis_retries'] + 1):
+            if attempt:
+                self._count('retries')
+                print(f"   ↻ Retrying analysis ({attempt}/{self.config['analysis_retries']})")
+            try:
+                analysis = self._stream_analysis(job_title, company, job_description)
+            except ValueError as e:
+                self._count('parse_failures')
+                print(f"   ⚠️  Could not parse AI response: {str(e)}")
+                continue
+            except Exception as e:
+                self._count('errors')
+                print(f"   ❌ AI analysis error: {str(e)}")
+                break
             
-            # Extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group())
-                print("   ✓ AI analysis complete")
+            if analysis.partial:
                 return analysis
-            else:
-                print("   ⚠️  Could not parse AI response")
-                return self._basic_analysis(job_description)
+            self.llm_cache.put('analysis', self.config['llm_model'], ANALYSIS_PROMPT_VERSION,
+                               job_description, analysis)
+            print("   ✓ AI analysis complete")
+            return analysis
+        
+        self._count('fallbacks')
+        return self._basic_analysis(job_description)
+    
+    def _stream_analysis(self, job_title, company, job_description):
+        """One streamed analysis call; returns a JobAnalysis or raises ValueError"""
+        request = self._analysis_request(job_title, company, job_description)
+        parser = AnalysisStreamParser()
+        checked = False
+        with self._llm_call() as client:
+            self._count('requests')
+            stream = client.chat.completions.create(
+                stream=True, stream_options={'include_usage': True}, **request
+            )
+            for chunk in stream:
+                if chunk.usage:
+                    self._count('completion_tokens', chunk.usage.completion_tokens)
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parser.feed(chunk.choices[0].delta.content)
                 
-        except Exception as e:
-            print(f"   ❌ AI analysis error: {str(e)}")
-            return self._basic_analysis(job_description)
+                if not checked and parser.has(SCORING_FIELDS):
+                    checked = True
+                    score = self.calculate_match_score(parser.fields, load_resume_index(self.master_resume_path))
+                    if score < self.config['min_match_score']:
+                        # Not worth the remaining tokens: the score stage will drop this job
+                        stream.close()
+                        self._count('early_stops')
+                        partial = JobAnalysis.from_data({
+                            'domain': '', 'responsibilities': [], **parser.fields
+                        })
+                        partial.partial = True
+                        return partial
+        return parser.result()
+    
+    def _cached_analysis(self, job_description, peek=False):
+        cached = self.llm_cache.get(
+            'analysis', self.config['llm_model'], ANALYSIS_PROMPT_VERSION, job_description,
+            near_duplicate=self.config['llm_cache_near_duplicates'], peek=peek
+        )
+        try:
+            return JobAnalysis.from_data(cached) if cached else None
+        except ValueError:
+            return None
+    
+    def _analysis_request(self, job_title, company, job_description):
+        """Chat completion arguments for the analysis prompt (interactive or batch)"""
+        description = ' '.join(job_description.split())
+        return {
+            'model': self.config['llm_model'],
+            'messages': [
+                {"role": "system", "content": ANALYSIS_INSTRUCTIONS},
+                {"role": "user", "content": f"Title: {job_title}\nCompany: {company}\n\n{description}"}
+            ],
+            'response_format': RESPONSE_FORMAT,
+            'max_tokens': 300,
+            'temperature': 0.2,
+        }
+    
+    def _parse_analysis(self, response_text, job_description):
+        """Validate a complete (batch) response and cache it; None if malformed"""
+        try:
+            analysis = JobAnalysis.from_json(response_text)
+        except ValueError as e:
+            self._count('parse_failures')
+            print(f"   ⚠️  Could not parse AI response: {str(e)}")
+            return None
+        self.llm_cache.put('analysis', self.config['llm_model'], ANALYSIS_PROMPT_VERSION,
+                           job_description, analysis)
+        print("   ✓ AI analysis complete")
+        return analysis
+    
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.analysis_stats[name] += amount
+    
+    def analysis_summary(self):
+        """One-line summary of analysis calls, parse failures and retries"""
+        stats = self.analysis_stats
+        if not stats['requests']:
+            return "🔎 AI analysis: no API calls"
+        return (
+            f"🔎 AI analysis: {stats['requests']} calls, "
+            f"{stats['parse_failures']} parse failures ({stats['parse_failures'] / stats['requests']:.0%}), "
+            f"{stats['retries']} retries, {stats['fallbacks']} fallbacks, {stats['early_stops']} stopped early, "
+            f"avg {stats['completion_tokens'] / stats['requests']:.0f} completion tokens"
+        )
     
     def _basic_analysis(self, job_description):
         """Fallback analysis without AI"""
         common_skills = ['SQL', 'Python', 'A/B testing', 'Agile', 'data analysis']
         found_skills = [skill for skill in common_skills if skill.lower() in job_description.lower()]
         
-        return {
+        return JobAnalysis({
             "required_skills": found_skills or common_skills[:3],
             "keywords": ["product roadmap", "stakeholder management", "user research"],
             "responsibilities": ["Product strategy", "Team leadership"],
             "seniority": "Senior",
             "domain": "General"
-        }
+        })
     
-    def calculate_match_score(self, analysis, master_resume_text):
-        """Calculate match score between job and resume"""
+    def calculate_match_score(self, analysis, master_resume):
+        """
+        Calculate match score between job and resume.
+        master_resume is a ResumeIndex (or plain resume text); every phrase is
+        matched as a case-insensitive substring in one pass.
+        """
+        if not isinstance(master_resume, ResumeIndex):
+            master_resume = ResumeIndex(master_resume)
+        found = master_resume.match(
+            list(analysis['required_skills']) + list(analysis['keywords']) + [analysis['seniority']]
+        )
         score = 0
         
         # Skills match (40 points)
-        skills_found = sum(
-            1 for skill in analysis['required_skills']
-            if skill.lower() in master_resume_text.lower()
-        )
+        skills_found = sum(1 for skill in analysis['required_skills'] if found[skill])
         score += (skills_found / len(analysis['required_skills'])) * 40 if analysis['required_skills'] else 0
         
         # Keywords match (30 points)
-        keywords_found = sum(
-            1 for keyword in analysis['keywords']
-            if keyword.lower() in master_resume_text.lower()
-        )
+        keywords_found = sum(1 for keyword in analysis['keywords'] if found[keyword])
         score += (keywords_found / len(analysis['keywords'])) * 30 if analysis['keywords'] else 0
         
         # Seniority match (30 points)
-        if analysis['seniority'].lower() in master_resume_text.lower():
+        if found[analysis['seniority']]:
             score += 30
         
         return int(score)
@@ -233,17 +444,8 @@ Format as JSON:
         try:
             print("   Creating customized resume...")
             
-            # Load master resume
-            doc = Document(self.master_resume_path)
-            
-            # TODO: Actually customize the resume based on analysis
-            # For now, just save a copy
-            # In full implementation:
-            # - Rewrite bullets to include keywords
-            # - Emphasize relevant experiences
-            # - Adjust summary
-            
-            doc.save(output_path)
+            # Parsed once per process; bullets and summary are tailored to the analysis
+            load_resume_renderer(self.master_resume_path).render(analysis, output_path)
             print(f"   ✓ Saved to {output_path}")
             
             return True
@@ -254,13 +456,26 @@ Format as JSON:
     
     def generate_cover_letter(self, job_title, company, analysis, output_path):
         """Generate tailored cover letter"""
-        if not self.anthropic_client:
-            print("   ⚠️  Skipping cover letter (no AI)")
-            return False
-        
         try:
-            print("   Generating cover letter...")
+            cover_letter = self.cover_letter_text(job_title, company, analysis)
+            if not cover_letter:
+                return False
+            
+            # Save cover letter as docx
+            self.cover_letter_renderer.render(
+                cover_letter_paragraphs(job_title, company, cover_letter), output_path
+            )
+            print(f"   ✓ Cover letter saved")
             
+            return True
+            
+        except Exception as e:
+            print(f"   ❌ Error generating cover letter: {str(e)}")
+            return False
+    
+    def cover_letter_text(self, job_title, company, analysis):
+        """Cover letter body from the LLM (or its cache); None without AI"""
+        try:
             prompt = f"""Write a professional cover letter for this job:
 
 Job Title: {job_title}
@@ -278,157 +493,430 @@ Write a compelling 3-paragraph cover letter that:
 Keep it professional but warm. Max 250 words.
 """
             
-            response = self.anthropic_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1024,
-                temperature=0.8
+            cover_letter = self.llm_cache.get(
+                'cover_letter', self.config['llm_model'], COVER_LETTER_PROMPT_VERSION, prompt
             )
-            
-            cover_letter = response.choices[0].message.content
-            
-            # Save cover letter as docx
-            doc = Document()
-            
-            # Add content
-            doc.add_paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}\n")
-            doc.add_paragraph(f"To: Hiring Manager\n{company}\n")
-            doc.add_paragraph(f"Re: Application for {job_title}\n")
-            
-            for para in cover_letter.split('\n\n'):
-                doc.add_paragraph(para)
-            
-            doc.add_paragraph("\nSincerely,\nRahul Kumar")
-            
-            doc.save(output_path)
-            print(f"   ✓ Cover letter saved")
-            
-            return True
+            if cover_letter:
+                print("   Using cached cover letter...")
+            elif not self.anthropic_client:
+                print("   ⚠️  Skipping cover letter (no AI)")
+                return None
+            else:
+                print("   Generating cover letter...")
+                response = self._chat_completion(
+                    model=self.config['llm_model'],
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=1024,
+                    temperature=0.8
+                )
+                
+                cover_letter = response.choices[0].message.content
+                self.llm_cache.put('cover_letter', self.config['llm_model'], COVER_LETTER_PROMPT_VERSION,
+                                   prompt, cover_letter)
+            return cover_letter
             
         except Exception as e:
             print(f"   ❌ Error generating cover letter: {str(e)}")
-            return False
+            return None
     
     def update_sheet_status(self, job_id, match_score, resume_path, cover_letter_path):
-        """Update Google Sheet with resume links and match score"""
+        """
+        Queue Google Sheet updates with resume links and match score (sent by flush_sheet_updates).
+        Returns False if the update could not be queued.
+        """
         if not self.sheet:
-            return
+            return True
         
         try:
-            # Find row with this job_id
-            all_data = self.sheet.get_all_values()
-            
             # Column layout: 1=Job ID, 2=Title, 3=Company, 4=Location, 5=Link, 6=Found Date, 7=Status, 8=Notes, 9=Description
-            for idx, row in enumerate(all_data[1:], start=2):  # Skip header
-                if row[0] == str(job_id):  # Job ID is first column
-                    self.sheet.update_cell(idx, 7, "Resume Ready")  # Status column
-                    # Match score and resume path in columns 10, 11
-                    if len(row) < 10:
-                        self.sheet.update_cell(idx, 10, f"{match_score}%")
-                    if len(row) < 11:
-                        self.sheet.update_cell(idx, 11, resume_path)
-                    
-                    print(f"   ✓ Updated Google Sheet")
-                    break
+            # Row index from this run's snapshot, or a saved one that still matches the sheet
+            row = self.sheet_repo.ensure_index().row_for(job_id)
+            if row is None:
+                print(f"   ⚠️  Job {job_id} not found in sheet")
+                return True  # Nothing to sync
+            
+            self.sheet_repo.queue_update(row, 7, "Resume Ready")  # Status column
+            # Match score and resume path in columns 10, 11 (only if not filled yet)
+            if not self.sheet_repo.cell(row, 10):
+                self.sheet_repo.queue_update(row, 10, f"{match_score}%")
+            if not self.sheet_repo.cell(row, 11):
+                self.sheet_repo.queue_update(row, 11, resume_path)
+            
+            print(f"   ✓ Queued Google Sheet update")
+            return True
                     
         except Exception as e:
             print(f"   ⚠️  Error updating sheet: {str(e)}")
+            return False
+    
+    def flush_sheet_updates(self):
+        """
+        Write all queued sheet updates in one batch request, then checkpoint
+        those jobs as synced. Returns False if the write failed (the jobs stay
+        rendered and the next run reconciles them).
+        """
+        with self._stats_lock:
+            job_ids, self._unsynced = self._unsynced, []
+        if self.sheet_repo:
+            try:
+                count = self.sheet_repo.flush()
+                if count:
+                    print(f"📊 Wrote {count} cell updates to Google Sheets")
+                print(self.sheet_repo.summary())
+            except Exception as e:
+                print(f"⚠️  Error flushing sheet updates: {str(e)}")
+                return False
+        self.journal.mark_synced(job_ids)
+        return True
+    
+    def reconcile_checkpoints(self):
+        """
+        Queue the sheet updates of every job that was rendered but never
+        synced and send them in one batch. Returns the Job IDs synced.
+        """
+        pending = self.journal.pending('rendered')
+        if not pending:
+            return set()
+        print(f"📒 Reconciling {len(pending)} rendered jobs with the sheet")
+        queued = [
+            job_id for job_id, fields in pending.items()
+            if self.update_sheet_status(job_id, fields.get('match_score'), fields.get('resume_path'),
+                                        fields.get('cover_letter_path'))
+        ]
+        with self._stats_lock:
+            self._unsynced.extend(queued)
+        return set(queued) if self.flush_sheet_updates() else set()
     
     def process_job(self, job):
-        """Process a single job"""
-        job_id = job.get('Job ID', 'unknown')
-        title = job.get('Title', 'Unknown Title')
-        company = job.get('Company', 'Unknown Company')
-        link = job.get('Link', '')
+        """Process a single job (runs every pipeline stage in order)"""
+        ctx = job
+        for _, stage in self._stages():
+            ctx = stage(ctx)
+            if ctx is None:
+                return False
+        return True
+    
+    def _stages(self):
+        """Ordered (name, function) pairs shared by process_job and the pipelined run"""
+        return [
+            ('describe', self._stage_describe),
+            ('screen', self._stage_screen),
+            ('analyze', self._stage_analyze),
+            ('score', self._stage_score),
+            ('letter', self._stage_letter),
+            ('render', self._stage_render),
+            ('sync', self._stage_sync),
+        ]
+    
+    def _checkpoint(self, ctx, state, **fields):
+        """Save a completed step for the job (jobs without an ID are not journaled)"""
+        if not reached(ctx.get('checkpoint'), state):
+            ctx['checkpoint'] = state
+        if ctx['job'].job_id:
+            self.journal.advance(ctx['job'].job_id, state, **fields)
+    
+    @staticmethod
+    def _done(ctx, step):
+        """True if the job completed step in this or an earlier run"""
+        if step == 'rendered' and reached(ctx.get('checkpoint'), step):
+            return os.path.exists(ctx.get('resume_path') or '')  # Re-render deleted documents
+        return reached(ctx.get('checkpoint'), step)
+    
+    def _stage_describe(self, job):
+        """Step 1: Get job description (from sheet first, then scrape from URL)"""
+        if isinstance(job, dict):
+            job = JobRecord.from_dict(job)  # Sheet record dicts from older callers
+        ctx = {'job': job}
+        ctx['job_id'] = job.job_id or 'unknown'
+        ctx['title'] = job.title or 'Unknown Title'
+        ctx['company'] = job.company or 'Unknown Company'
+        link = job.link
         
         print(f"\n{'='*60}")
-        print(f"Processing: {title} at {company}")
+        print(f"Processing: {ctx['title']} at {ctx['company']}")
         print(f"{'='*60}")
         
-        # Step 1: Get job description (from sheet first, then scrape from URL)
-        description = job.get('Description', '').strip() if job.get('Description') else None
+        state, saved = self.journal.load(job.job_id) if job.job_id else (None, {})
+        if state:
+            ctx.update(saved)
+            ctx['checkpoint'] = state
+            if 'analysis' in saved:
+                ctx['analysis'] = JobAnalysis.from_data(saved['analysis'])
+            print(f"   ↩️  [{ctx['job_id']}] Resuming after the '{state}' step")
+            return ctx
+        
+        description = job.description.strip() or None
         if not description and link:
-            description = self.scrape_job_description(link)
+            description = self.scrape_job_description(link, job_id=job.job_id)
         
         if not description or len(description) < 100:
-            print("   ⚠️  Job description too short or missing, skipping")
-            return False
+            print(f"   ⚠️  [{ctx['job_id']}] Job description too short or missing, skipping")
+            return None
+        ctx['description'] = description
+        ctx['fit'] = self.semantic.fit(job.job_id, description)
+        print(f"   🔍 [{ctx['job_id']}] Semantic fit: {ctx['fit']:.2f}")
+        self._checkpoint(ctx, 'described', description=description, fit=ctx['fit'])
         
-        # Step 2: Analyze with AI
-        analysis = self.analyze_job_with_ai(title, company, description)
+        canonical = self.duplicates.link(job.job_id, job.company, job.title, job.location,
+                                         description) if job.job_id else None
+        if canonical and canonical != job.job_id:
+            _, original = self.journal.load(canonical, resume=False)
+            if 'analysis' in original:
+                print(f"   🔁 [{ctx['job_id']}] Repost of job {canonical}, reusing its analysis")
+                ctx['analysis'] = JobAnalysis.from_data(original['analysis'])
+                self._checkpoint(ctx, 'analyzed', analysis=ctx['analysis'])
+        return ctx
+    
+    def _stage_screen(self, ctx):
+        """Step 2: Skip jobs below the minimum semantic fit before any analysis"""
+        if self._done(ctx, 'analyzed'):
+            return ctx
+        passed, fit = self.prescreen.passes(ctx['job'].job_id, ctx['description'])
+        if not passed:
+            print(f"   ⏭️  [{ctx['job_id']}] Semantic fit {fit:.2f} below "
+                  f"{self.prescreen.threshold:.2f}, skipping")
+            return None
+        return ctx
+    
+    def _stage_analyze(self, ctx):
+        """Step 3: Analyze with AI"""
+        if not self._done(ctx, 'analyzed'):
+            ctx['analysis'] = self.analyze_job_with_ai(ctx['title'], ctx['company'], ctx['description'])
+            self._checkpoint(ctx, 'analyzed', analysis=ctx['analysis'])
+        return ctx
+    
+    def _stage_score(self, ctx):
+        """Steps 4-5: Calculate match score against the (cached) master resume index"""
+        if not self._done(ctx, 'scored'):
+            ctx['match_score'] = self.calculate_match_score(ctx['analysis'], load_resume_index(self.master_resume_path))
+            self._checkpoint(ctx, 'scored', match_score=ctx['match_score'])
+        print(f"   📊 [{ctx['job_id']}] Match Score: {ctx['match_score']}%")
         
-        # Step 3: Read master resume for match scoring
-        master_text = ""
+        if ctx['match_score'] < self.config['min_match_score']:
+            print(f"   ⚠️  [{ctx['job_id']}] Score below minimum ({self.config['min_match_score']}%), skipping")
+            return None
+        return ctx
+    
+    def _stage_letter(self, ctx):
+        """Step 6: Write the cover letter text (LLM call, or cached)"""
+        if not self._done(ctx, 'rendered'):
+            ctx['cover_letter'] = self.cover_letter_text(ctx['title'], ctx['company'], ctx['analysis'])
+        return ctx
+    
+    def _stage_render(self, ctx):
+        """Steps 7-8: Render the tailored resume and cover letter in the document process pool"""
+        if self._done(ctx, 'rendered'):
+            return ctx
         try:
-            master_doc = Document(self.master_resume_path)
-            master_text = '\n'.join([p.text for p in master_doc.paragraphs])
-        except:
-            pass
-        
-        # Step 4: Calculate match score
-        match_score = self.calculate_match_score(analysis, master_text)
-        print(f"   📊 Match Score: {match_score}%")
-        
-        if match_score < self.config['min_match_score']:
-            print(f"   ⚠️  Score below minimum ({self.config['min_match_score']}%), skipping")
-            return False
-        
-        # Step 5: Create output folder
-        folder_name = f"{job_id}_{company.replace(' ', '_')}_{title.replace(' ', '_')[:20]}"
-        job_folder = os.path.join(self.config['output_folder'], folder_name)
-        os.makedirs(job_folder, exist_ok=True)
+            result = self.documents.submit(ctx['job'], ctx['analysis'], ctx['cover_letter']).result()
+        except Exception as e:
+            result = e
+        return self._rendered(ctx, result)
+    
+    def _rendered(self, ctx, result):
+        """Record a render result (paths, or the exception raised) on ctx; None if rendering failed"""
+        if isinstance(result, Exception):
+            print(f"   ❌ [{ctx['job_id']}] Error rendering documents: {str(result)}")
+            return None
+        ctx['resume_path'], ctx['cover_letter_path'] = result
+        self._checkpoint(ctx, 'rendered', resume_path=ctx['resume_path'], cover_letter_path=ctx['cover_letter_path'])
+        print(f"   ✓ [{ctx['job_id']}] Saved to {ctx['resume_path']}")
+        if ctx['cover_letter_path']:
+            print(f"   ✓ [{ctx['job_id']}] Cover letter saved")
+        return ctx
+    
+    def _stage_sync(self, ctx):
+        """Step 9: Update Google Sheet (queued, flushed once per run)"""
+        if self.update_sheet_status(ctx['job_id'], ctx['match_score'], ctx['resume_path'], ctx['cover_letter_path']) \
+                and ctx['job'].job_id:
+            with self._stats_lock:
+                self._unsynced.append(ctx['job'].job_id)
+        print(f"   ✅ [{ctx['job_id']}] Job processed successfully!")
+        return ctx
+    
+    @contextmanager
+    def _llm_call(self):
+        """Hold an LLM slot (concurrency limit and request rate) while using the client"""
+        with self._llm_slots:
+            self._llm_rate.acquire()
+            yield self.anthropic_client
+    
+    def _chat_completion(self, **kwargs):
+        """OpenAI chat call gated by the LLM concurrency limit and request rate"""
+        with self._llm_call() as client:
+            return client.chat.completions.create(**kwargs)
+    
+    def run(self, pipelined=True):
+        """
+        Main execution.
+        pipelined=True overlaps jobs across stages, each with its own
+        concurrency limit (config['stage_workers']); pipelined=False
+        processes jobs one after another.
+        """
+        print("🤖 Agent 2: Resume Customizer Starting...\n")
         
-        # Step 6: Customize resume
-        resume_path = os.path.join(job_folder, f"Resume_RahulKumar_{company.replace(' ', '')}.docx")
-        resume_success = self.customize_resume(title, company, analysis, resume_path)
+        # Fetch unprocessed jobs
+        jobs = self.fetch_unprocessed_jobs()
         
-        # Step 7: Generate cover letter
-        cover_letter_path = os.path.join(job_folder, f"CoverLetter_{company.replace(' ', '')}.docx")
-        cover_letter_success = self.generate_cover_letter(title, company, analysis, cover_letter_path)
+        if not jobs:
+            print("✅ No jobs to process")
+            return
         
-        # Step 8: Update Google Sheet
-        if resume_success:
-            self.update_sheet_status(job_id, match_score, resume_path, cover_letter_path)
-            print(f"   ✅ Job processed successfully!")
-            return True
+        # Process each job
+        processed = 0
+        pipeline = None
+        try:
+            if pipelined:
+                pipeline = Pipeline()
+                for name, stage in self._stages():
+                    pipeline.add_stage(name, stage, workers=self.config['stage_workers'][name])
+                processed = len(pipeline.run(jobs))
+            else:
+                for job in jobs:
+                    try:
+                        if self.process_job(job):
+                            processed += 1
+                    except Exception as e:
+                        print(f"❌ Error processing job: {str(e)}")
+                        continue
+        finally:
+            # Send every status update in one request, even if the run is interrupted
+            self.flush_sheet_updates()
+            self.documents.close()
         
-        return False
+        self._print_run_summary(processed, len(jobs), [pipeline] if pipeline else [])
     
-    def run(self):
-        """Main execution"""
-        print("🤖 Agent 2: Resume Customizer Starting...\n")
+    def run_batch(self, runner=None):
+        """
+        Batch execution for large backlogs.
+        Fetches and pre-screens every description first, sends all uncached
+        analysis prompts as one OpenAI Batch API job, scores the results and
+        writes cover letters through the pipeline, renders every document in
+        one batch across the render processes, then syncs. runner defaults
+        to the live Batch API; pass a RecordedBatchRunner to replay a saved
+        batch output offline.
+        """
+        print("🤖 Agent 2: Resume Customizer Starting (batch mode)...\n")
+        
+        if runner is None:
+            if not self.anthropic_client:
+                print("⚠️  Batch mode needs the OpenAI API, running interactively instead")
+                return self.run()
+            runner = OpenAIBatchRunner(
+                self.anthropic_client,
+                poll_interval=self.config['batch_poll_seconds'],
+                record_path=self.config['batch_record_path']
+            )
         
-        # Fetch unprocessed jobs
         jobs = self.fetch_unprocessed_jobs()
         
         if not jobs:
             print("✅ No jobs to process")
             return
         
-        # Process each job
+        stages = dict(self._stages())
+        workers = self.config['stage_workers']
         processed = 0
-        for job in jobs:
-            try:
-                if self.process_job(job):
-                    processed += 1
-                
-                # Rate limiting
-                time.sleep(3)
-                
-            except Exception as e:
-                print(f"❌ Error processing job: {str(e)}")
-                continue
+        pipelines = []
+        try:
+            describe = Pipeline().add_stage('describe', stages['describe'], workers=workers['describe'])
+            describe.add_stage('screen', stages['screen'], workers=workers['screen'])
+            pipelines.append(describe)
+            contexts = describe.run(jobs)
+            
+            # custom_id is the Job ID, so a recorded batch replays onto the same jobs;
+            # contexts arrive in completion order, so repeated IDs are numbered in a fixed order
+            pending = {}
+            for ctx in sorted(contexts, key=self._batch_order):
+                if self._done(ctx, 'analyzed'):
+                    continue
+                ctx['analysis'] = self._cached_analysis(ctx['description'])
+                if ctx['analysis']:
+                    self._checkpoint(ctx, 'analyzed', analysis=ctx['analysis'])
+                    continue
+                custom_id, repeat = ctx['job_id'], 1
+                while custom_id in pending:
+                    repeat += 1
+                    custom_id = f"{ctx['job_id']}#{repeat}"
+                pending[custom_id] = ctx
+            print(f"\n🧠 {len(contexts) - len(pending)} analyses cached, {len(pending)} to batch")
+            
+            requests = [
+                batch_request(custom_id, **self._analysis_request(ctx['title'], ctx['company'], ctx['description']))
+                for custom_id, ctx in pending.items()
+            ]
+            results = runner.run(requests) if requests else {}
+            # One submission, but each completed response counts as a call (as in interactive runs)
+            completed = [custom_id for custom_id in pending if results.get(custom_id) is not None]
+            self._count('requests', len(completed))
+            self._count('completion_tokens', sum(runner.usage.get(custom_id, 0) for custom_id in completed))
+            for custom_id, ctx in pending.items():
+                ctx['analysis'] = self._parse_analysis(results.get(custom_id), ctx['description'])
+                if ctx['analysis'] is None:
+                    # Failed or malformed batch responses are retried interactively
+                    self._count('retries')
+                    ctx['analysis'] = self.analyze_job_with_ai(ctx['title'], ctx['company'], ctx['description'])
+                self._checkpoint(ctx, 'analyzed', analysis=ctx['analysis'])
+            
+            prepare = Pipeline()
+            pipelines.append(prepare)
+            for name in ('score', 'letter'):
+                prepare.add_stage(name, stages[name], workers=workers[name])
+            contexts = prepare.run(contexts)
+            
+            # Every document still to render in one batch across the render processes
+            rendered = [ctx for ctx in contexts if self._done(ctx, 'rendered')]
+            todo = [ctx for ctx in contexts if not self._done(ctx, 'rendered')]
+            print(f"\n📄 Rendering documents for {len(todo)} jobs ({len(rendered)} already rendered)...")
+            results = self.documents.render_batch(
+                (ctx['job'], ctx['analysis'], ctx['cover_letter']) for ctx in todo
+            )
+            contexts = rendered + [ctx for ctx, result in zip(todo, results) if self._rendered(ctx, result)]
+            
+            sync = Pipeline().add_stage('sync', stages['sync'], workers=workers['sync'])
+            pipelines.append(sync)
+            processed = len(sync.run(contexts))
+        finally:
+            self.flush_sheet_updates()
+            self.documents.close()
         
+        self._print_run_summary(processed, len(jobs), pipelines)
+    
+    @staticmethod
+    def _batch_order(ctx):
+        job = ctx['job']
+        return (ctx['job_id'], job.link or '', ctx['title'], ctx['company'], ctx.get('description') or '')
+    
+    def _print_run_summary(self, processed, total, pipelines):
         print(f"\n{'='*60}")
-        print(f"✅ Processed {processed} out of {len(jobs)} jobs")
+        print(f"✅ Processed {processed} out of {total} jobs")
         print(f"📂 Output folder: {self.config['output_folder']}")
+        for pipeline in pipelines:
+            print(pipeline.summary())
+        print(self.documents.summary())
+        print(self.http.summary())
+        print(self.description_cache.summary())
+        print(self.extractor.summary())
+        print(self.llm_cache.summary())
+        print(self.analysis_summary())
+        stats = self.analysis_stats
+        print(self.prescreen.summary(stats['seconds'] / stats['analyzed_jobs'] if stats['analyzed_jobs'] else None))
+        print(self.journal.summary())
+        print(self.duplicates.summary())
         print(f"{'='*60}")
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Agent 2: customize resumes for new jobs")
+    parser.add_argument('--batch', action='store_true',
+                        help="Analyze all jobs with one OpenAI Batch API job (for large backlogs)")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="Batch mode answered from a recorded batch output file (offline)")
+    parser.add_argument('--sequential', action='store_true', help="Process jobs one at a time")
+    args = parser.parse_args()
     
     # Check for required files
     if not os.path.exists('resume_master.docx'):
@@ -446,7 +934,12 @@ def main():
         use_sheets=os.path.exists('credentials.json')
     )
     
-    customizer.run()
+    if args.replay:
+        customizer.run_batch(runner=RecordedBatchRunner(args.replay))
+    elif args.batch:
+        customizer.run_batch()
+    else:
+        customizer.run(pipelined=not args.sequential)
 
 
 if __name__ == "__main__":
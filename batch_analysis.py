@@ -0,0 +1,128 @@
+"""
+OpenAI Batch API support for Agent 2
+Submit many chat completion requests as one JSONL batch and collect the results,
+or replay a recorded batch output file offline
+"""
+
+import json
+import os
+import tempfile
+import time
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+FINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+def batch_request(custom_id, **body):
+    """One line of a batch input file: a chat completion request tagged with custom_id"""
+    return {'custom_id': str(custom_id), 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body}
+
+
+def parse_batch_output(lines, usage=None):
+    """
+    Map custom_id -> message content from batch output lines.
+    Failed requests map to None. If usage is a dict, the completion tokens
+    of each successful response are stored in it by custom_id.
+    """
+    results = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        content = None
+        if response.get('status_code') == 200 and not record.get('error'):
+            choices = response.get('body', {}).get('choices') or []
+            if choices:
+                content = choices[0]['message']['content']
+                if usage is not None:
+                    usage[record['custom_id']] = (response['body'].get('usage') or {}).get('completion_tokens', 0)
+        results[record['custom_id']] = content
+    return results
+
+
+class OpenAIBatchRunner:
+    """
+    Run requests through the OpenAI Batch API.
+
+    run() uploads the requests as a JSONL file, creates a batch, polls it every
+    poll_interval seconds until it finishes (or timeout passes) and returns
+    {custom_id: content}. If record_path is set the raw output file is saved
+    there so the same results can be replayed with RecordedBatchRunner.
+    usage maps custom_id -> completion tokens of the last run's responses.
+    """
+    def __init__(self, client, poll_interval=30, timeout=24 * 3600, record_path=None):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.record_path = record_path
+        self.usage = {}
+
+    def submit(self, requests):
+        """Upload the input file and create the batch. Returns the batch object."""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.writelines(json.dumps(request) + '\n' for request in requests)
+            input_path = f.name
+        try:
+            with open(input_path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose='batch')
+        finally:
+            os.remove(input_path)
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window='24h'
+        )
+        print(f"📦 Submitted batch {batch.id} with {len(requests)} requests")
+        return batch
+
+    def wait(self, batch):
+        """Poll until the batch reaches a final status"""
+        deadline = time.time() + self.timeout
+        while batch.status not in FINAL_STATUSES:
+            if time.time() > deadline:
+                raise TimeoutError(f"Batch {batch.id} still {batch.status} after {self.timeout}s")
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts:
+                print(f"   ⏳ Batch {batch.status}: {counts.completed}/{counts.total} done, {counts.failed} failed")
+        return batch
+
+    def results(self, batch):
+        """Download and parse the output file of a finished batch"""
+        if batch.status != 'completed' or not batch.output_file_id:
+            print(f"   ⚠️  Batch {batch.id} ended with status {batch.status}")
+            return {}
+        text = self.client.files.content(batch.output_file_id).text
+        if self.record_path:
+            if os.path.dirname(self.record_path):
+                os.makedirs(os.path.dirname(self.record_path), exist_ok=True)
+            with open(self.record_path, 'w') as f:
+                f.write(text)
+        self.usage = {}
+        return parse_batch_output(text.splitlines(), self.usage)
+
+    def run(self, requests):
+        if not requests:
+            return {}
+        return self.results(self.wait(self.submit(requests)))
+
+
+class RecordedBatchRunner:
+    """
+    Offline stand-in for OpenAIBatchRunner that answers from a recorded batch
+    output file (the JSONL the Batch API returns). Requests without a
+    recorded response map to None.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.usage = {}
+
+    def run(self, requests):
+        self.usage = {}
+        with open(self.path, 'r') as f:
+            recorded = parse_batch_output(f, self.usage)
+        print(f"📼 Replaying {len(recorded)} recorded batch responses from {self.path}")
+        return {request['custom_id']: recorded.get(request['custom_id']) for request in requests}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the search-page card parsers.
+Checks every installed backend against html.parser on the saved fixture
+pages, then times each one.
+Run: python bench_card_parser.py [iterations]
+"""
+import glob
+import sys
+import time
+
+from card_parser import BACKENDS, parse_search_page
+
+FIXTURES = sorted(glob.glob('fixtures/search_page_*.html'))
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+
+def comparable(jobs):
+    # found_date is a timestamp taken at parse time, so leave it out
+    return [{k: v for k, v in job.to_dict().items() if k != 'found_date'} for job in jobs]
+
+
+pages = [open(path, encoding='utf-8').read() for path in FIXTURES]
+if not pages:
+    print("No fixture pages found in fixtures/")
+    sys.exit(1)
+
+total_cards = sum(len(parse_search_page(html, backend='html.parser')) for html in pages)
+print(f"Fixtures: {len(pages)} pages, {total_cards} job cards, {ITERATIONS} iterations\n")
+
+baseline = [comparable(parse_search_page(html, backend='html.parser')) for html in pages]
+results = {}
+for name in BACKENDS:
+    output = [comparable(parse_search_page(html, backend=name)) for html in pages]
+    matches = output == baseline
+
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for html in pages:
+            parse_search_page(html, backend=name)
+    elapsed = time.perf_counter() - started
+
+    per_page_ms = elapsed / (ITERATIONS * len(pages)) * 1000
+    results[name] = per_page_ms
+    print(f"{name:12s} {per_page_ms:8.3f} ms/page   output {'matches' if matches else 'DIFFERS from'} html.parser")
+
+print()
+base_ms = results['html.parser']
+for name, per_page_ms in results.items():
+    if name != 'html.parser':
+        print(f"{name}: {base_ms / per_page_ms:.1f}x faster than html.parser")
@@ -0,0 +1,204 @@
+"""
+Search-page card parsers for the LinkedIn job tracker
+Pluggable backends that turn a jobs-guest search page into job records
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+from job_record import JobRecord
+
+# Optional faster backends (lxml ships with python-docx; selectolax is opt-in)
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+JOB_URN_RE = re.compile(r'urn:li:jobPosting:(\d+)')
+JOB_ID_DASH_RE = re.compile(r'-(\d+)(?:\?|$)')
+JOB_ID_SLASH_RE = re.compile(r'/(\d+)(?:\?|$)')
+
+TITLE_CLASS = 'base-search-card__title'
+LINK_CLASS = 'base-card__full-link'
+COMPANY_CLASS = 'base-search-card__subtitle'
+LOCATION_CLASS = 'job-search-card__location'
+
+# Returned for a card whose title the title filter rejects. Page parsers put a
+# None placeholder in its place so callers can still tell a full page from a short one.
+REJECTED = object()
+
+
+def job_id_from_link(job_link):
+    """Extract job ID from URL (format: .../jobs/view/title-company-1234567890)"""
+    match = JOB_ID_DASH_RE.search(job_link) or JOB_ID_SLASH_RE.search(job_link)
+    return match.group(1) if match else None
+
+
+def make_job(job_id, title, company, location, link):
+    """Build the job record used throughout the tracker"""
+    return JobRecord.new(job_id, title, company, location, link)
+
+
+def parse_card_bs4(card, title_filter=None):
+    """
+    Extract job information from a BeautifulSoup job card.
+    Returns REJECTED if title_filter rejects the card's title.
+    """
+    try:
+        # Find job title and link
+        title_elem = card.find('h3', class_=TITLE_CLASS)
+        link_elem = card.find('a', class_=LINK_CLASS)
+
+        if not title_elem or not link_elem:
+            return None
+        if title_filter and not title_filter(title_elem.text.strip()):
+            return REJECTED
+
+        company_elem = card.find('h4', class_=COMPANY_CLASS)
+        location_elem = card.find('span', class_=LOCATION_CLASS)
+        job_link = link_elem.get('href', '').split('?')[0]  # Clean URL
+        return make_job(
+            job_id_from_link(job_link),
+            title_elem.text.strip(),
+            company_elem.text.strip() if company_elem else "Unknown",
+            location_elem.text.strip() if location_elem else "Unknown",
+            job_link
+        )
+
+    except Exception as e:
+        print(f"⚠️  Error parsing job card: {str(e)}")
+        return None
+
+
+def _parse_page_bs4(html, title_filter=None):
+    soup = BeautifulSoup(html, 'html.parser')
+    jobs = []
+    for card in soup.find_all('li'):
+        _collect(jobs, parse_card_bs4(card, title_filter))
+    return jobs
+
+
+def _collect(jobs, job_data):
+    if job_data is REJECTED:
+        jobs.append(None)
+    elif job_data:
+        jobs.append(job_data)
+
+
+def _finish_card(fields, urn, title_filter=None):
+    """Turn the fields collected for one card into a job record (None if incomplete)"""
+    if 'title' not in fields or 'link' not in fields:
+        return None
+    if title_filter and not title_filter(fields['title']):
+        return REJECTED
+    job_link = fields['link'].split('?')[0]
+    urn_match = JOB_URN_RE.search(urn or '')
+    return make_job(
+        urn_match.group(1) if urn_match else job_id_from_link(job_link),
+        fields['title'],
+        fields.get('company', "Unknown"),
+        fields.get('location', "Unknown"),
+        job_link
+    )
+
+
+def _parse_page_lxml(html, title_filter=None):
+    root = lxml.html.document_fromstring(html)
+    wanted = {
+        ('h3', TITLE_CLASS): 'title',
+        ('a', LINK_CLASS): 'link',
+        ('h4', COMPANY_CLASS): 'company',
+        ('span', LOCATION_CLASS): 'location',
+    }
+    jobs = []
+    for card in root.iter('li'):
+        fields = {}
+        urn = None
+        # One walk over the card's elements picks up every field
+        for el in card.iter('h3', 'a', 'h4', 'span', 'div'):
+            classes = el.get('class')
+            if el.tag == 'div':
+                if urn is None and el.get('data-entity-urn'):
+                    urn = el.get('data-entity-urn')
+                continue
+            if not classes:
+                continue
+            for cls in classes.split():
+                key = wanted.get((el.tag, cls))
+                if key and key not in fields:
+                    fields[key] = el.get('href', '') if key == 'link' else el.text_content().strip()
+                    break
+        _collect(jobs, _finish_card(fields, urn, title_filter))
+    return jobs
+
+
+def _parse_page_selectolax(html, title_filter=None):
+    tree = HTMLParser(html)
+    selector = (
+        f'h3.{TITLE_CLASS}, a.{LINK_CLASS}, h4.{COMPANY_CLASS}, '
+        f'span.{LOCATION_CLASS}, [data-entity-urn]'
+    )
+    keys = {'h3': 'title', 'a': 'link', 'h4': 'company', 'span': 'location'}
+    jobs = []
+    for card in tree.css('li'):
+        fields = {}
+        urn = None
+        # A single combined selector query returns all fields in document order
+        for node in card.css(selector):
+            if urn is None and 'data-entity-urn' in node.attributes:
+                urn = node.attributes['data-entity-urn']
+            key = keys.get(node.tag)
+            if key and key not in fields:
+                if key == 'link':
+                    fields[key] = node.attributes.get('href') or ''
+                else:
+                    fields[key] = node.text(deep=True).strip()
+        _collect(jobs, _finish_card(fields, urn, title_filter))
+    return jobs
+
+
+BACKENDS = {'html.parser': _parse_page_bs4}
+if lxml is not None:
+    BACKENDS['lxml'] = _parse_page_lxml
+if HTMLParser is not None:
+    BACKENDS['selectolax'] = _parse_page_selectolax
+
+
+def default_backend():
+    """Fastest installed backend"""
+    for name in ('selectolax', 'lxml', 'html.parser'):
+        if name in BACKENDS:
+            return name
+
+
+def parse_search_page(html, backend='auto', title_filter=None):
+    """
+    Parse a search results page into a list of job records.
+
+    title_filter (a callable taking a title) is applied per card before the
+    job record is built; rejected cards appear as None in the list.
+
+    Falls back to the html.parser path when the fast backend fails or finds
+    no cards on a page that clearly contains some (unexpected markup).
+    """
+    name = default_backend() if backend == 'auto' else backend
+    parse = BACKENDS.get(name, _parse_page_bs4)
+    if parse is _parse_page_bs4:
+        return _parse_page_bs4(html, title_filter)
+    try:
+        jobs = parse(html, title_filter)
+    except Exception as e:
+        print(f"⚠️  {name} parser failed ({str(e)}), falling back to html.parser")
+        return _parse_page_bs4(html, title_filter)
+    if not jobs and '<li' in html:
+        return _parse_page_bs4(html, title_filter)
+    return jobs
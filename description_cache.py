@@ -0,0 +1,166 @@
+"""
+On-disk cache of LinkedIn job descriptions
+SQLite store keyed by job_id, shared by the job tracker and Agent 2
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'descriptions.sqlite3')
+
+
+def job_id_from_url(url):
+    """Extract the numeric LinkedIn job ID from a job URL (None if absent)"""
+    url = (url or '').split('?')[0].rstrip('/')
+    match = re.search(r'-(\d+)$', url) or re.search(r'/(\d+)$', url)
+    return match.group(1) if match else None
+
+
+class DescriptionCache:
+    """
+    Persistent description cache.
+
+    Each entry holds the zlib-compressed raw HTML, the extracted text, a hash
+    of the HTML, the fetch time and the ETag/Last-Modified validators.
+    Entries are served without a request for ttl_days, then kept as stale
+    (revalidated with a conditional request) until max_age_days, when
+    eviction deletes them. Once the cache grows past max_bytes the least
+    recently used entries are dropped.
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_days=7, max_age_days=60,
+                 max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_age = max_age_days * 86400
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS descriptions (
+                job_id TEXT PRIMARY KEY,
+                content_hash TEXT,
+                html BLOB,
+                text TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_descriptions_accessed ON descriptions(accessed_at)')
+        self.conn.commit()
+        self.evict()
+
+    def get(self, job_id):
+        """
+        Return the cached entry for job_id as a dict, or None.
+        Check entry['fresh'] before using the text without revalidating.
+        """
+        if not job_id:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT text, fetched_at, etag, last_modified, content_hash FROM descriptions WHERE job_id = ?',
+                (str(job_id),)
+            ).fetchone()
+            fresh = row is not None and now - row[1] < self.ttl
+            if fresh:
+                self.hits += 1
+                self.conn.execute('UPDATE descriptions SET accessed_at = ? WHERE job_id = ?', (now, str(job_id)))
+                self.conn.commit()
+            else:
+                self.misses += 1
+        if row is None:
+            return None
+        return {
+            'text': row[0],
+            'fetched_at': row[1],
+            'etag': row[2],
+            'last_modified': row[3],
+            'content_hash': row[4],
+            'fresh': fresh,
+        }
+
+    def get_html(self, job_id):
+        """Return the cached raw HTML for job_id (decompressed), or None"""
+        with self._lock:
+            row = self.conn.execute('SELECT html FROM descriptions WHERE job_id = ?', (str(job_id),)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row and row[0] else None
+
+    def put(self, job_id, html, text, etag=None, last_modified=None):
+        """Store (or replace) the entry for job_id"""
+        if not job_id:
+            return
+        now = time.time()
+        raw = (html or '').encode('utf-8')
+        blob = zlib.compress(raw, 6)
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO descriptions '
+                '(job_id, content_hash, html, text, fetched_at, accessed_at, etag, last_modified, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (str(job_id), hashlib.sha256(raw).hexdigest(), blob, text, now, now,
+                 etag, last_modified, len(blob) + len((text or '').encode('utf-8')))
+            )
+            self.conn.commit()
+            self._puts += 1
+            due = self._puts % 200 == 0
+        if due:
+            self.evict()
+
+    def touch(self, job_id):
+        """Mark a stale entry as fresh again (e.g. after a 304 Not Modified)"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                'UPDATE descriptions SET fetched_at = ?, accessed_at = ? WHERE job_id = ?',
+                (now, now, str(job_id))
+            )
+            self.conn.commit()
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def evict(self):
+        """Drop entries past max_age, then least recently used ones until under max_bytes"""
+        with self._lock:
+            self.conn.execute('DELETE FROM descriptions WHERE fetched_at < ?', (time.time() - self.max_age,))
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM descriptions').fetchone()[0]
+            if total > self.max_bytes:
+                rows = self.conn.execute('SELECT job_id, size FROM descriptions ORDER BY accessed_at').fetchall()
+                doomed = []
+                for job_id, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((job_id,))
+                    total -= size
+                self.conn.executemany('DELETE FROM descriptions WHERE job_id = ?', doomed)
+            self.conn.commit()
+
+    def summary(self):
+        """One-line summary of cache hits and misses"""
+        return f"🗄️  Description cache: {self.hits} hits, {self.misses} misses"
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
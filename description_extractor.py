@@ -0,0 +1,157 @@
+"""
+Job description extraction for LinkedIn posting pages
+Tiered: description subtree -> single-pass marker scan -> body text
+"""
+
+import html as html_lib
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Common LinkedIn description containers, in order of preference (class names may vary)
+DESCRIPTION_CONTAINERS = [
+    ('div', 'description__text'),
+    ('div', 'show-more-less-html__markup'),
+    ('section', 'description'),
+    ('div', 'job-view-layout jobs-details'),
+]
+START_MARKERS = ['Job Description', 'Job Overview', 'About the job']
+END_MARKERS = ['Show more', 'Seniority level', 'Employment type', 'Job function',
+               'Industries', 'Referrals', 'Featured Benefits']
+BODY_KEYWORDS = ['responsibilities', 'experience', 'product', 'skills']
+
+# One alternation finds every start and end marker in a single sweep
+MARKER_RE = re.compile(
+    '(?P<start>' + '|'.join(re.escape(m) for m in START_MARKERS) + ')'
+    '|(?P<end>' + '|'.join(re.escape(m) for m in END_MARKERS) + ')',
+    re.IGNORECASE
+)
+SCRIPT_RE = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+BLANK_RE = re.compile(r'\s*\n\s*')
+
+
+def _container_classes():
+    classes = set()
+    for _, cls in DESCRIPTION_CONTAINERS:
+        classes.add(cls)
+        classes.update(cls.split())
+    return classes
+
+
+CONTAINER_CLASSES = _container_classes()
+
+
+def _is_container(name, attrs):
+    """SoupStrainer filter: keep only elements that could hold the description"""
+    if name not in ('div', 'section'):
+        return False
+    classes = (attrs or {}).get('class') or ''
+    if isinstance(classes, list):
+        classes = ' '.join(classes)
+    return any(cls in CONTAINER_CLASSES for cls in classes.split())
+
+
+def page_text(html):
+    """
+    Visible text of the page body, one text node per line.
+    Built once with linear regex passes instead of a full parse tree.
+    """
+    body_start = html.find('<body')
+    if body_start > 0:
+        html = html[body_start:]
+    text = TAG_RE.sub('\n', SCRIPT_RE.sub('', html))
+    return BLANK_RE.sub('\n', html_lib.unescape(text)).strip()
+
+
+def scan_markers(text, min_length=200):
+    """
+    Find the description between a start marker and the next end marker.
+
+    Equivalent to trying `(start).*?(?=end)` for each start marker in order,
+    but every marker is located in one pass over the text.
+    """
+    first_start = {}
+    ends = []
+    for match in MARKER_RE.finditer(text):
+        if match.lastgroup == 'start':
+            first_start.setdefault(match.group().lower(), match.start())
+        else:
+            ends.append(match.start())
+
+    for marker in START_MARKERS:
+        pos = first_start.get(marker.lower())
+        if pos is None:
+            continue
+        idx = bisect_left(ends, pos + len(marker))
+        if idx == len(ends):
+            continue
+        candidate = text[pos:ends[idx]].strip()
+        if len(candidate) >= min_length:
+            return candidate
+    return None
+
+
+class DescriptionExtractor:
+    """
+    Extract description text from a posting page, cheapest tier first.
+
+    container: parse only the description subtree (SoupStrainer)
+    markers:   single-pass start/end marker scan over the page text
+    body:      whole body text, if it looks like job content
+    Hit counts per tier are kept in self.stats.
+    """
+    def __init__(self):
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def extract(self, html):
+        """Return the description text, or None"""
+        return self.extract_with_tier(html)[0]
+
+    def extract_with_tier(self, html):
+        """Return (description, tier) where tier names the stage that succeeded"""
+        text, tier = None, 'none'
+        if html and len(html) >= 500:
+            text = self._from_container(html)
+            if text:
+                tier = 'container'
+            else:
+                full_text = page_text(html)
+                text = scan_markers(full_text)
+                if text:
+                    tier = 'markers'
+                elif len(full_text) >= 500 and any(kw in full_text.lower() for kw in BODY_KEYWORDS):
+                    text, tier = full_text, 'body'
+        with self._lock:
+            self.stats[tier] += 1
+        return text, tier
+
+    def _from_container(self, html):
+        # Cheap substring check before paying for any parsing
+        if not any(cls in html for cls in CONTAINER_CLASSES):
+            return None
+        soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(_is_container))
+        for name, cls in DESCRIPTION_CONTAINERS:
+            desc_div = soup.find(name, class_=cls)
+            if desc_div:
+                text = desc_div.get_text(strip=True, separator='\n')
+                if len(text) >= 100:
+                    return text
+                return None
+        return None
+
+    def summary(self):
+        """One-line summary of which tier produced each description"""
+        with self._lock:
+            total = sum(self.stats.values())
+            if not total:
+                return "🧩 Description extractor: no pages parsed"
+            parts = ', '.join(
+                f"{tier} {self.stats[tier]} ({self.stats[tier] / total:.0%})"
+                for tier in ('container', 'markers', 'body', 'none') if self.stats[tier]
+            )
+        return f"🧩 Description extractor: {parts}"
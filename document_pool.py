@@ -0,0 +1,109 @@
+"""
+Process-pool document generation for Agent 2
+Renders tailored resumes and cover letters on every core; each worker loads
+the master resume and cover-letter templates once at start-up
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from docx_renderer import CoverLetterRenderer, ResumeRenderer, cover_letter_paragraphs
+
+_worker = {}  # Per-process renderers, set by _init_worker
+
+
+def document_paths(output_folder, job_id, title, company):
+    """Deterministic (resume path, cover letter path) for a job"""
+    folder_name = f"{job_id}_{company.replace(' ', '_')}_{title.replace(' ', '_')[:20]}"
+    job_folder = os.path.join(output_folder, folder_name)
+    return (
+        os.path.join(job_folder, f"Resume_RahulKumar_{company.replace(' ', '')}.docx"),
+        os.path.join(job_folder, f"CoverLetter_{company.replace(' ', '')}.docx"),
+    )
+
+
+def _init_worker(master_resume_path):
+    _worker['resume'] = ResumeRenderer(master_resume_path)
+    _worker['cover_letter'] = CoverLetterRenderer()
+
+
+def _render(output_folder, job, analysis, cover_letter):
+    """Write one job's documents (atomically); returns (resume path, cover letter path or None)"""
+    title = job.title or 'Unknown Title'
+    company = job.company or 'Unknown Company'
+    resume_path, cover_letter_path = document_paths(output_folder, job.job_id or 'unknown', title, company)
+    os.makedirs(os.path.dirname(resume_path), exist_ok=True)
+    _worker['resume'].render(analysis, resume_path)
+    if not cover_letter:
+        return resume_path, None
+    _worker['cover_letter'].render(cover_letter_paragraphs(title, company, cover_letter), cover_letter_path)
+    return resume_path, cover_letter_path
+
+
+class DocumentRenderPool:
+    """
+    Renders (job, analysis, cover-letter text) tasks in worker processes.
+
+    Workers start on first use and are spawned (not forked), so they are
+    safe to start from the pipeline's threads. A task with no cover-letter
+    text renders only the resume.
+    """
+    def __init__(self, master_resume_path, output_folder, workers=None):
+        self.master_resume_path = master_resume_path
+        self.output_folder = output_folder
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.rendered = 0
+        self.failed = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.master_resume_path,),
+                )
+            return self._executor
+
+    def submit(self, job, analysis, cover_letter=None):
+        """Future of (resume path, cover letter path or None) for one job"""
+        future = self._pool().submit(_render, self.output_folder, job, dict(analysis), cover_letter)
+        future.add_done_callback(self._count)
+        return future
+
+    def _count(self, future):
+        with self._lock:
+            if future.exception() is None:
+                self.rendered += 1
+            else:
+                self.failed += 1
+
+    def render_batch(self, tasks):
+        """
+        Render a batch of (job, analysis, cover_letter) tuples across the pool.
+        Returns one (resume path, cover letter path) per task, in order, or
+        the exception raised while rendering it.
+        """
+        futures = [self.submit(job, analysis, cover_letter) for job, analysis, cover_letter in tasks]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def summary(self):
+        """One-line summary of rendered documents"""
+        return f"📄 Documents: {self.rendered} rendered, {self.failed} failed ({self.workers} processes)"
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
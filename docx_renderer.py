@@ -0,0 +1,304 @@
+"""
+Template-cached DOCX rendering for Agent 2
+The master resume and the cover-letter template are unzipped and parsed once;
+each output patches word/document.xml and writes the zip directly, copying
+every other part unchanged
+"""
+
+import copy
+import io
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from docx import Document
+from lxml import etree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+DOCUMENT_PART = 'word/document.xml'
+
+SUMMARY_HEADINGS = ('PROFESSIONAL SUMMARY', 'SUMMARY')
+MAX_SUMMARY_STRENGTHS = 5
+
+# Characters outside the XML 1.0 Char production (control characters, lone surrogates, U+FFFE/FFFF)
+_INVALID_XML_CHARS = re.compile('[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+_cache = {}  # path -> (mtime, ResumeRenderer)
+_cache_lock = threading.Lock()
+
+
+def _w(tag):
+    return f'{{{W_NS}}}{tag}'
+
+
+def _text(paragraph):
+    return ''.join(paragraph.itertext(_w('t')))
+
+
+def _xml_text(text):
+    """text without characters XML cannot hold (LLM output may contain e.g. \\x0b)"""
+    return _INVALID_XML_CHARS.sub('', text)
+
+
+def atomic_write(path, data):
+    """Write bytes to a temp file beside path, then rename it over path"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def cover_letter_paragraphs(job_title, company, cover_letter, date=None):
+    """Paragraphs of a cover letter: header lines, the letter body and the sign-off"""
+    date = date or datetime.now()
+    paragraphs = [
+        f"Date: {date.strftime('%B %d, %Y')}\n",
+        f"To: Hiring Manager\n{company}\n",
+        f"Re: Application for {job_title}\n",
+    ]
+    paragraphs += cover_letter.split('\n\n')
+    paragraphs.append("\nSincerely,\nRahul Kumar")
+    return paragraphs
+
+
+def _phrase_pattern(phrases):
+    """Case-insensitive alternation of whole phrases, longest first (None if there are none)"""
+    phrases = sorted({p.strip() for p in phrases if p and p.strip()}, key=len, reverse=True)
+    if not phrases:
+        return None
+    return re.compile(r'(?<!\w)(' + '|'.join(re.escape(p) for p in phrases) + r')(?!\w)', re.IGNORECASE)
+
+
+class DocxTemplate:
+    """
+    A .docx package read once and written back out per document.
+
+    Every part except the replaceable ones is compressed once into a base
+    archive; writing a document copies those bytes and appends the patched
+    parts, so large unchanged parts (styles, themes) are never recompressed.
+    """
+    def __init__(self, source, replaceable=(DOCUMENT_PART,)):
+        with zipfile.ZipFile(source) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir()]
+            self.parts = {info.filename: (info, archive.read(info)) for info in infos}
+        self.replaceable = [name for name in replaceable if name in self.parts]
+        base = io.BytesIO()
+        with zipfile.ZipFile(base, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, (info, data) in self.parts.items():
+                if name not in self.replaceable:
+                    archive.writestr(info, data, zipfile.ZIP_DEFLATED)
+        self.base = base.getvalue()
+
+    def part(self, name):
+        return self.parts[name][1]
+
+    def write(self, output, replacements):
+        """Write the package to output (path or file), with parts in replacements swapped in"""
+        buffer = io.BytesIO(self.base)
+        with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as archive:
+            for name in self.replaceable:
+                info, data = self.parts[name]
+                archive.writestr(info, replacements.get(name, data), zipfile.ZIP_DEFLATED)
+        if hasattr(output, 'write'):
+            output.write(buffer.getvalue())
+        else:
+            atomic_write(output, buffer.getvalue())
+
+
+class ResumeRenderer:
+    """
+    Tailors the master resume to a job analysis without touching its layout.
+
+    - Bullets within each role are reordered so the ones mentioning the
+      job's skills and keywords come first (paragraph formatting such as the
+      spacing after a role's last bullet stays where it was).
+    - Skills and keywords already present in a bullet are set in bold.
+    - The summary gains a sentence naming the job's skills and keywords
+      that the resume already backs up.
+
+    Only phrases that occur in the resume are ever emphasized or named, so
+    nothing is claimed that the master resume does not already say.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.template = DocxTemplate(path)
+        self.root = etree.fromstring(self.template.part(DOCUMENT_PART))
+        self._locate()
+
+    def _locate(self):
+        """Record paragraph positions of the summary and of each run of bullets"""
+        paragraphs = list(self.root.iter(_w('p')))
+        self.summary = None
+        self.bullet_groups = []
+        group = []
+        for i, paragraph in enumerate(paragraphs):
+            if paragraph.find(f"{_w('pPr')}/{_w('numPr')}") is not None:
+                group.append(i)
+                continue
+            if group:
+                self.bullet_groups.append(group)
+                group = []
+            if self.summary is None and i > 0 and _text(paragraphs[i - 1]).strip().upper() in SUMMARY_HEADINGS:
+                self.summary = i
+        if group:
+            self.bullet_groups.append(group)
+        self.resume_text = '\n'.join(_text(p) for p in paragraphs).lower()
+
+    def render(self, analysis, output):
+        """Write the tailored resume for analysis to output (path or file)"""
+        root = copy.deepcopy(self.root)
+        paragraphs = list(root.iter(_w('p')))
+        phrases = list(analysis.get('required_skills', [])) + list(analysis.get('keywords', []))
+        found = _phrase_pattern(phrases)
+        backed = {m.group(1).lower() for m in found.finditer(self.resume_text)} if found else set()
+        phrases = [p for p in phrases if p.strip().lower() in backed]
+        pattern = _phrase_pattern(phrases)
+        if pattern is not None:
+            for group in self.bullet_groups:
+                self._reorder([paragraphs[i] for i in group], pattern)
+                for i in group:
+                    self._emphasize(paragraphs[i], pattern)
+            if self.summary is not None:
+                self._tailor_summary(paragraphs[self.summary], phrases)
+        xml = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+        self.template.write(output, {DOCUMENT_PART: xml})
+
+    @staticmethod
+    def _reorder(bullets, pattern):
+        """Move the content of the most relevant bullets to the top of the group (stable)"""
+        relevance = [len({m.group(1).lower() for m in pattern.finditer(_text(p))}) for p in bullets]
+        order = sorted(range(len(bullets)), key=lambda i: -relevance[i])
+        if order == list(range(len(bullets))):
+            return
+        contents = [[child for child in p if child.tag != _w('pPr')] for p in bullets]
+        for paragraph, source in zip(bullets, order):
+            for child in list(paragraph):
+                if child.tag != _w('pPr'):
+                    paragraph.remove(child)
+            paragraph.extend(contents[source])
+
+    @staticmethod
+    def _emphasize(paragraph, pattern):
+        """Split plain-text runs around matched phrases and bold the matches"""
+        for run in list(paragraph.findall(_w('r'))):
+            texts = run.findall(_w('t'))
+            if len(texts) != 1 or len(run) - (run.find(_w('rPr')) is not None) != 1:
+                continue
+            text = texts[0].text or ''
+            pieces, last = [], 0
+            for match in pattern.finditer(text):
+                pieces += [(text[last:match.start()], False), (match.group(0), True)]
+                last = match.end()
+            if not pieces:
+                continue
+            pieces.append((text[last:], False))
+            position = paragraph.index(run)
+            paragraph.remove(run)
+            for text_piece, bold in pieces:
+                if not text_piece:
+                    continue
+                piece = copy.deepcopy(run)
+                piece.find(_w('t')).text = text_piece
+                if bold:
+                    _set_bold(piece)
+                paragraph.insert(position, piece)
+                position += 1
+
+    @staticmethod
+    def _tailor_summary(paragraph, phrases):
+        """Append the phrases the summary does not mention yet"""
+        written = _phrase_pattern(phrases)
+        seen = {m.group(1).lower() for m in written.finditer(_text(paragraph))} if written else set()
+        strengths = []
+        for phrase in phrases:
+            key = phrase.strip().lower()
+            if key not in seen:
+                seen.add(key)
+                strengths.append(phrase.strip())
+        runs = paragraph.findall(_w('r'))
+        if not strengths or not runs:
+            return
+        run = copy.deepcopy(runs[-1])
+        for child in list(run):
+            if child.tag != _w('rPr'):
+                run.remove(child)
+        t = etree.SubElement(run, _w('t'))
+        t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+        t.text = _xml_text(" Key strengths for this role: " + ", ".join(strengths[:MAX_SUMMARY_STRENGTHS]) + ".")
+        runs[-1].addnext(run)
+
+
+def _set_bold(run):
+    """Add w:b/w:bCs to a run's properties, in schema order (after rStyle/rFonts)"""
+    properties = run.find(_w('rPr'))
+    if properties is None:
+        properties = etree.Element(_w('rPr'))
+        run.insert(0, properties)
+    if properties.find(_w('b')) is not None:
+        return
+    position = 0
+    while position < len(properties) and properties[position].tag in (_w('rStyle'), _w('rFonts')):
+        position += 1
+    properties.insert(position, etree.Element(_w('bCs')))
+    properties.insert(position, etree.Element(_w('b')))
+
+
+class CoverLetterRenderer:
+    """
+    Cover letters on python-docx's default template (the one Document() uses),
+    loaded once. Each letter is a list of paragraphs; newlines become line
+    breaks, as with doc.add_paragraph().
+    """
+    def __init__(self, template_path=None):
+        if template_path is None:
+            buffer = io.BytesIO()
+            Document().save(buffer)
+            buffer.seek(0)
+            template_path = buffer
+        self.template = DocxTemplate(template_path)
+        xml = self.template.part(DOCUMENT_PART).decode('utf-8')
+        body_start = xml.index('>', xml.index('<w:body')) + 1
+        section = xml.rfind('<w:sectPr', body_start)
+        body_end = section if section != -1 else xml.rindex('</w:body>')
+        self.head, self.tail = xml[:body_start], xml[body_end:]
+
+    @staticmethod
+    def _paragraph(text):
+        lines = []
+        for i, line in enumerate(text.split('\n')):
+            if i:
+                lines.append('<w:br/>')
+            for j, segment in enumerate(line.split('\t')):
+                if j:
+                    lines.append('<w:tab/>')
+                if segment:
+                    lines.append(f'<w:t xml:space="preserve">{escape(_xml_text(segment))}</w:t>')
+        return f'<w:p><w:r>{"".join(lines)}</w:r></w:p>' if lines else '<w:p/>'
+
+    def render(self, paragraphs, output):
+        """Write a document with one paragraph per string to output (path or file)"""
+        body = ''.join(self._paragraph(text) for text in paragraphs)
+        self.template.write(output, {DOCUMENT_PART: (self.head + body + self.tail).encode('utf-8')})
+
+
+def load_resume_renderer(path):
+    """Shared ResumeRenderer for path, rebuilt only when the file changes"""
+    mtime = os.path.getmtime(path)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    renderer = ResumeRenderer(path)
+    with _cache_lock:
+        _cache[path] = (mtime, renderer)
+    return renderer
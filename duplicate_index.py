@@ -0,0 +1,170 @@
+"""
+Near-duplicate job postings across the tracker's history
+MinHash signatures of normalized company, title and description shingles,
+banded for LSH in SQLite so a lookup only compares a handful of candidates
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_DUPLICATE_INDEX_PATH = os.path.join('.cache', 'duplicates.sqlite3')
+
+NUM_PERM = 128
+BANDS = 32  # 4 rows per band: postings 70%+ similar almost surely share a band (candidates are then verified)
+
+_PRIME = np.uint64((1 << 32) - 5)  # Largest prime below 2^32: a * x fits in 64 bits for 32-bit a and x
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize(text):
+    """Lowercase words only, so punctuation, spacing and case changes don't matter"""
+    return ' '.join(re.findall(r'\w+', (text or '').lower()))
+
+
+def features(company, title, description, shingle_size=3):
+    """Company and title words plus word shingles of the description"""
+    words = normalize(description).split()
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return shingles | {'company:' + normalize(company)} | {'title:' + w for w in normalize(title).split()}
+
+
+class MinHasher:
+    """
+    MinHash over num_perm universal hash functions (a * x + b mod p) of
+    32-bit item hashes, p = 2^32 - 5. Each step is reduced mod p before the
+    next, so no intermediate value overflows uint64.
+    """
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+    def signature(self, items):
+        if not items:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.array([
+            int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=4).digest(), 'little')
+            for item in items
+        ], dtype=np.uint64)
+        permuted = ((hashes[:, None] * self.a) % _PRIME + self.b) % _PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class DuplicateIndex:
+    """
+    History of postings, each linked to its canonical (earliest seen) posting.
+
+    link() checks a job against every posting seen before: its MinHash
+    signature is cut into BANDS bands, postings sharing any band bucket are
+    the only candidates, and a candidate whose estimated Jaccard similarity
+    is at least threshold makes the job a repost of that posting's
+    canonical. Only descriptions are compared: the same company, title and
+    location is often a separate opening, not a repost.
+    """
+    def __init__(self, path=DEFAULT_DUPLICATE_INDEX_PATH, threshold=0.7, num_perm=NUM_PERM, bands=BANDS):
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.checked = 0
+        self.reposts = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS postings (
+                job_id TEXT PRIMARY KEY,
+                canonical_id TEXT,
+                signature BLOB NOT NULL,
+                seen_at REAL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER,
+                bucket INTEGER,
+                job_id TEXT
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket)')
+        self.conn.commit()
+
+    def _buckets(self, signature):
+        return [
+            int.from_bytes(
+                hashlib.blake2b(signature[i * self.rows:(i + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                'little', signed=True
+            )
+            for i in range(self.bands)
+        ]
+
+    def canonical(self, job_id):
+        """Canonical Job ID of an indexed posting, or None"""
+        with self._lock:
+            row = self.conn.execute('SELECT canonical_id FROM postings WHERE job_id = ?', (str(job_id),)).fetchone()
+        return row[0] if row else None
+
+    def _nearest(self, signature, buckets):
+        where = ' OR '.join('(band = ? AND bucket = ?)' for _ in buckets)
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        rows = self.conn.execute(
+            f'SELECT p.canonical_id, p.signature FROM postings p JOIN '
+            f'(SELECT DISTINCT job_id FROM bands WHERE {where}) c ON c.job_id = p.job_id',
+            params
+        ).fetchall()
+        best, best_similarity = None, 0.0
+        for canonical_id, stored in rows:
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint32) == signature))
+            if similarity > best_similarity:
+                best, best_similarity = canonical_id, similarity
+        return (best, best_similarity) if best_similarity >= self.threshold else (None, best_similarity)
+
+    def link(self, job_id, company, title, location, description):
+        """
+        Index a job and return its canonical Job ID: an earlier posting it
+        duplicates, or job_id itself. Linking the same job again returns
+        the same answer.
+        """
+        job_id = str(job_id)
+        signature = self.hasher.signature(features(company, title, description))
+        buckets = self._buckets(signature)
+        with self._lock:
+            row = self.conn.execute('SELECT canonical_id FROM postings WHERE job_id = ?', (job_id,)).fetchone()
+            if row:
+                return row[0]
+            self.checked += 1
+            canonical_id, _ = self._nearest(signature, buckets)
+            if canonical_id:
+                self.reposts += 1
+            canonical_id = canonical_id or job_id
+            self.conn.execute(
+                'INSERT INTO postings (job_id, canonical_id, signature, seen_at) VALUES (?, ?, ?, ?)',
+                (job_id, canonical_id, signature.tobytes(), time.time())
+            )
+            self.conn.executemany(
+                'INSERT INTO bands (band, bucket, job_id) VALUES (?, ?, ?)',
+                [(band, bucket, job_id) for band, bucket in enumerate(buckets)]
+            )
+            self.conn.commit()
+        return canonical_id
+
+    def summary(self):
+        """One-line summary of reposts found"""
+        if not self.checked:
+            return "🔁 Duplicates: no new postings checked"
+        return f"🔁 Duplicates: {self.reposts} of {self.checked} postings were reposts"
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,218 @@
+"""
+Shared HTTP transport for the job tracker and Agent 2
+Pooled keep-alive session with retries, per-host rate limiting and timing counters
+"""
+
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# urllib3 only decodes brotli responses when one of these packages is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Referer': 'https://www.linkedin.com/jobs/',
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces requests to a single host"""
+    def __init__(self, rate=1.0, capacity=5):
+        self.rate = rate  # Tokens refilled per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for a pool of workers.
+
+    The limit grows by one after every `increase_every` successful requests
+    and halves whenever a caller reports throttling, never leaving
+    [minimum, maximum].
+    """
+    def __init__(self, initial=2, minimum=1, maximum=8, increase_every=5):
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase_every = increase_every
+        self.peak = self.limit
+        self.active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Block until fewer than `limit` requests are in flight"""
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+
+    def release(self, throttled=False):
+        """Finish a request and adjust the limit based on how it went"""
+        with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.increase_every and self.limit < self.maximum:
+                    self.limit += 1
+                    self.peak = max(self.peak, self.limit)
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+class HttpClient:
+    """
+    Pooled requests.Session shared by every LinkedIn call.
+
+    Connections are kept alive and reused across requests, 429/5xx responses
+    and connection errors are retried with exponential backoff plus jitter,
+    and every request is timed so a run can report its network cost.
+    """
+    def __init__(self, headers=None, pool_size=16, max_retries=3, backoff=1.0,
+                 max_backoff=30.0, timeout=15, requests_per_second=2.0, burst=8):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        # Retries are handled in get() so they share the rate limiter and counters
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._rate_limiters = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'errors': 0,
+            'seconds': 0.0,
+            'status': Counter(),
+        }
+
+    def rate_limiter(self, url):
+        """Return the shared token bucket for the host of this URL"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._rate_limiters:
+                self._rate_limiters[host] = TokenBucket(self.requests_per_second, self.burst)
+            return self._rate_limiters[host]
+
+    def get(self, url, max_retries=None, **kwargs):
+        """
+        GET a URL through the pooled session.
+
+        Retryable statuses are retried up to max_retries times; the last
+        response is returned as-is so callers can still inspect status_code.
+        Network errors are re-raised once retries are exhausted.
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self.rate_limiter(url)
+
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(time.perf_counter() - started, None)
+                if attempt >= retries:
+                    raise
+                self._sleep_before_retry(attempt, None)
+                continue
+
+            self._record(time.perf_counter() - started, response.status_code)
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+            self._sleep_before_retry(attempt, response)
+
+    def _sleep_before_retry(self, attempt, response):
+        """Exponential backoff with jitter, honouring Retry-After when present"""
+        with self._lock:
+            self.stats['retries'] += 1
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = min(self.max_backoff, max(delay, int(retry_after)))
+        time.sleep(delay)
+
+    def _record(self, elapsed, status_code):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['seconds'] += elapsed
+            if status_code is None:
+                self.stats['errors'] += 1
+            else:
+                self.stats['status'][status_code] += 1
+
+    def summary(self):
+        """One-line summary of request counts and latency"""
+        with self._lock:
+            count = self.stats['requests']
+            if not count:
+                return "🌐 HTTP: no requests made"
+            avg_ms = self.stats['seconds'] / count * 1000
+            statuses = ', '.join(f"{code}×{n}" for code, n in sorted(self.stats['status'].items()))
+            return (f"🌐 HTTP: {count} requests, {self.stats['retries']} retries, "
+                    f"{self.stats['errors']} errors, avg {avg_ms:.0f} ms ({statuses or 'no responses'})")
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide HttpClient, creating it on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
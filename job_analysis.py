@@ -0,0 +1,145 @@
+"""
+Typed job analysis for Agent 2
+JSON schema for structured LLM output, validation, and an incremental parser
+for streamed responses
+"""
+
+import json
+
+SENIORITY_LEVELS = ['Junior', 'Mid', 'Senior', 'Principal']
+
+# Fields are ordered so everything calculate_match_score needs arrives first
+SCORING_FIELDS = ('seniority', 'required_skills', 'keywords')
+
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'seniority': {'type': 'string', 'enum': SENIORITY_LEVELS},
+        'required_skills': {'type': 'array', 'items': {'type': 'string'}},
+        'keywords': {'type': 'array', 'items': {'type': 'string'}},
+        'domain': {'type': 'string'},
+        'responsibilities': {'type': 'array', 'items': {'type': 'string'}},
+    },
+    'required': ['seniority', 'required_skills', 'keywords', 'domain', 'responsibilities'],
+    'additionalProperties': False,
+}
+
+RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {'name': 'job_analysis', 'strict': True, 'schema': ANALYSIS_SCHEMA},
+}
+
+
+class JobAnalysis(dict):
+    """
+    Validated analysis result.
+    Still a dict (so it caches as JSON and works with analysis['keywords']),
+    with typed attribute access on top. partial is True when the response
+    was cut off after the scoring fields (domain/responsibilities missing).
+    """
+    partial = False
+
+    @classmethod
+    def from_data(cls, data):
+        """Validate a decoded object; raises ValueError if it does not match the schema"""
+        if not isinstance(data, dict):
+            raise ValueError("analysis is not an object")
+        for name in ('required_skills', 'keywords', 'responsibilities'):
+            value = data.get(name)
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f"'{name}' must be a list of strings")
+        for name in ('seniority', 'domain'):
+            if not isinstance(data.get(name), str):
+                raise ValueError(f"'{name}' must be a string")
+        return cls({name: data[name] for name in ANALYSIS_SCHEMA['required']})
+
+    @classmethod
+    def from_json(cls, text):
+        try:
+            return cls.from_data(json.loads(text or ''))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e.msg}")
+
+    @property
+    def required_skills(self):
+        return self['required_skills']
+
+    @property
+    def keywords(self):
+        return self['keywords']
+
+    @property
+    def responsibilities(self):
+        return self['responsibilities']
+
+    @property
+    def seniority(self):
+        return self['seniority']
+
+    @property
+    def domain(self):
+        return self['domain']
+
+
+class AnalysisStreamParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    feed() takes response chunks as they arrive and decodes each top-level
+    field as soon as its value is complete, so callers can act on
+    SCORING_FIELDS before the rest of the response has been generated.
+    """
+    def __init__(self):
+        self.text = ''
+        self.fields = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._pair_start = None
+
+    def feed(self, chunk):
+        """Consume a chunk; returns the names of fields completed by it"""
+        completed = []
+        start = len(self.text)
+        self.text += chunk
+        for pos in range(start, len(self.text)):
+            ch = self.text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+                if self._depth == 1:
+                    self._pair_start = pos + 1
+            elif ch in '}]':
+                if self._depth == 1:
+                    completed += self._complete_pair(pos)
+                self._depth -= 1
+            elif ch == ',' and self._depth == 1:
+                completed += self._complete_pair(pos)
+                self._pair_start = pos + 1
+        return completed
+
+    def _complete_pair(self, end):
+        pair = self.text[self._pair_start:end].strip()
+        if not pair:
+            return []
+        try:
+            field = json.loads('{' + pair + '}')
+        except json.JSONDecodeError:
+            return []  # The full parse in result() reports the error
+        self.fields.update(field)
+        return list(field)
+
+    def has(self, names):
+        return all(name in self.fields for name in names)
+
+    def result(self):
+        """Validate the complete response; raises ValueError on malformed output"""
+        return JobAnalysis.from_json(self.text)
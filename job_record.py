@@ -0,0 +1,129 @@
+"""
+Compact job record shared by the job tracker and Agent 2
+Slotted dataclass with interned repeated strings and an int timestamp, plus
+conversions to and from sheet rows and the JSON backup format
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Sheet columns written by the tracker, in order (Agent 2 adds columns after these)
+SHEET_HEADERS = ['Job ID', 'Title', 'Company', 'Location', 'Link', 'Found Date', 'Status', 'Notes', 'Description']
+
+_NAMES = ['job_id', 'title', 'company', 'location', 'link', 'found_date', 'status', 'notes', 'description']
+
+# Keys accepted by record['...'] / record.get('...'): JSON backup keys and sheet headers
+_KEYS = {**{name: name for name in _NAMES}, **dict(zip(SHEET_HEADERS, _NAMES))}
+
+# Fields written to the JSON backup, in the order the tracker has always used
+JSON_FIELDS = ['job_id', 'title', 'company', 'location', 'link', 'found_date', 'status', 'notes']
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else ('' if value is None else str(value))
+
+
+def parse_timestamp(value):
+    """Epoch seconds from an int or a 'YYYY-mm-dd HH:MM:SS' local time string (0 if unknown)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(time.mktime(time.strptime(str(value).strip(), DATE_FORMAT)))
+    except (ValueError, OverflowError):
+        return 0
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    One job posting.
+
+    Titles, companies, locations, status and notes are interned, so the many
+    repeated values share one string object. found_at is epoch seconds;
+    found_date gives the formatted string used in the sheet and backups.
+
+    Records also answer record['title'] / record.get('Job ID') for both the
+    JSON keys and the sheet headers, so code written against dicts keeps working.
+    """
+    job_id: str
+    title: str
+    company: str
+    location: str
+    link: str
+    found_at: int = 0
+    status: str = 'New'
+    notes: str = ''
+    description: str = ''
+
+    def __post_init__(self):
+        self.job_id = '' if self.job_id is None else str(self.job_id)
+        self.title = _intern(self.title)
+        self.company = _intern(self.company)
+        self.location = _intern(self.location)
+        self.link = self.link or ''
+        self.status = _intern(self.status)
+        self.notes = _intern(self.notes)
+        self.description = self.description or ''
+
+    @classmethod
+    def new(cls, job_id, title, company, location, link):
+        """A freshly found job (status New, found now)"""
+        return cls(job_id, title, company, location, link, int(time.time()))
+
+    @property
+    def found_date(self):
+        return time.strftime(DATE_FORMAT, time.localtime(self.found_at)) if self.found_at else ''
+
+    # Dict-style access for existing callers
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, _KEYS[key])
+
+    def get(self, key, default=None):
+        return getattr(self, _KEYS[key]) if key in _KEYS else default
+
+    def __contains__(self, key):
+        return key in _KEYS
+
+    # JSON backup
+    def to_dict(self):
+        """Backup form: the dict layout the tracker has always written"""
+        return {field: self[field] for field in JSON_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """From a backup dict or a sheet record dict (keys may be sheet headers)"""
+        data = {_KEYS.get(key, key): value for key, value in data.items()}
+        return cls(
+            data.get('job_id'),
+            data.get('title', ''),
+            data.get('company', ''),
+            data.get('location', ''),
+            data.get('link', ''),
+            parse_timestamp(data.get('found_at', data.get('found_date'))),
+            data.get('status', 'New'),
+            data.get('notes', ''),
+            data.get('description', ''),
+        )
+
+    # Google Sheets
+    def to_sheet_row(self, description=None):
+        """Row for SHEET_HEADERS; description overrides the record's own"""
+        return [
+            self.job_id, self.title, self.company, self.location, self.link,
+            self.found_date, self.status, self.notes,
+            self.description if description is None else description,
+        ]
+
+    @classmethod
+    def from_sheet_row(cls, row, header=SHEET_HEADERS):
+        """Build a record from a sheet row laid out as header (extra columns are ignored)"""
+        values = {}
+        for i, name in enumerate(header):
+            if name in _KEYS and i < len(row):
+                values[_KEYS[name]] = row[i]
+        return cls.from_dict(values)
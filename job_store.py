@@ -0,0 +1,150 @@
+"""
+Local SQLite job store for the LinkedIn job tracker
+Indexed history of every job seen, with JSON/NDJSON export for backups
+
+Usage:
+    python job_store.py export linkedin_pm_jobs.json
+    python job_store.py export linkedin_pm_jobs.ndjson --format ndjson
+    python job_store.py import linkedin_pm_jobs.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+from ndjson_backup import iter_jobs
+
+DEFAULT_STORE_PATH = os.path.join('.cache', 'jobs.sqlite3')
+
+# Column order matches the job dicts (and therefore the JSON backup)
+FIELDS = ['job_id', 'title', 'company', 'location', 'link', 'found_date', 'status', 'notes']
+# Fields refreshed when a known job is seen again; status/notes/found_date are kept
+REFRESH_FIELDS = ['title', 'company', 'location']
+
+
+class JobStore:
+    """
+    SQLite table of jobs with unique indexes on job_id and link, so
+    deduplication is an index lookup and each run only writes new rows.
+    """
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                {', '.join(f'{field} TEXT' for field in FIELDS)}
+            )
+        ''')
+        self.conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs(job_id)')
+        self.conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_link ON jobs(link)')
+        self.conn.commit()
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def contains(self, job_id=None, link=None):
+        """True if a job with this job_id or link is already stored"""
+        row = self.conn.execute(
+            'SELECT 1 FROM jobs WHERE job_id = ? OR link = ? LIMIT 1',
+            (str(job_id) if job_id else None, link or None)
+        ).fetchone()
+        return row is not None
+
+    def upsert_many(self, jobs, refresh=True):
+        """
+        Insert new jobs and (with refresh) update title/company/location of
+        known ones. Returns the list of jobs that were new.
+        """
+        new_jobs = []
+        placeholders = ', '.join('?' for _ in FIELDS)
+        refresh = ', '.join(f'{field} = ?' for field in REFRESH_FIELDS)
+        with self.conn:
+            for job in jobs:
+                values = [self._value(job, field) for field in FIELDS]
+                cursor = self.conn.execute(
+                    f'INSERT INTO jobs ({", ".join(FIELDS)}) VALUES ({placeholders}) ON CONFLICT DO NOTHING',
+                    values
+                )
+                if cursor.rowcount:
+                    new_jobs.append(job)
+                elif refresh and values[0]:
+                    self.conn.execute(
+                        f'UPDATE jobs SET {refresh} WHERE job_id = ?',
+                        [self._value(job, field) for field in REFRESH_FIELDS] + [values[0]]
+                    )
+        return new_jobs
+
+    @staticmethod
+    def _value(job, field):
+        value = job.get(field)
+        if field in ('job_id', 'link') and not value:
+            return None  # NULLs never collide in the unique indexes
+        return None if value is None else str(value)
+
+    def iter_jobs(self):
+        """Yield stored jobs as dicts, oldest first"""
+        cursor = self.conn.execute(f'SELECT {", ".join(FIELDS)} FROM jobs ORDER BY id')
+        for row in cursor:
+            yield dict(zip(FIELDS, row))
+
+    def export(self, filename, fmt='json'):
+        """
+        Write every stored job to filename, streaming rows from the database.
+        fmt='json' produces the same layout as json.dump(jobs, f, indent=2);
+        fmt='ndjson' writes one compact JSON object per line.
+        """
+        count = 0
+        tmp_path = filename + '.tmp'
+        with open(tmp_path, 'w') as f:
+            if fmt == 'ndjson':
+                for job in self.iter_jobs():
+                    f.write(json.dumps(job) + '\n')
+                    count += 1
+            else:
+                f.write('[')
+                for job in self.iter_jobs():
+                    item = json.dumps(job, indent=2).replace('\n', '\n  ')
+                    f.write((',\n  ' if count else '\n  ') + item)
+                    count += 1
+                f.write('\n]' if count else ']')
+        os.replace(tmp_path, filename)
+        return count
+
+    def import_json(self, filename):
+        """
+        Add jobs from a JSON (list) or NDJSON backup that the store is missing
+        (stored jobs are left as they are). Returns the number of new jobs.
+        """
+        return len(self.upsert_many(iter_jobs(filename), refresh=False))
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the local job store")
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('filename')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default=None,
+                        help="Export format (default: from file extension)")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="Path to the SQLite store")
+    args = parser.parse_args()
+
+    store = JobStore(args.store)
+    if args.command == 'export':
+        fmt = args.format or ('ndjson' if args.filename.endswith('.ndjson') else 'json')
+        count = store.export(args.filename, fmt=fmt)
+        print(f"💾 Exported {count} jobs to {args.filename}")
+    else:
+        count = store.import_json(args.filename)
+        print(f"📥 Imported {count} new jobs from {args.filename} (store now has {store.count()})")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
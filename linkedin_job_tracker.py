@@ -3,31 +3,54 @@ LinkedIn Product Management Job Tracker with Google Sheets Integration
 Personal use job hunting tool
 """
 
-import requests
-from bs4 import BeautifulSoup
 import time
-import json
-from datetime import datetime
-import re
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from http_client import AdaptiveLimiter, get_client
+from description_cache import DescriptionCache
+from card_parser import REJECTED, parse_card_bs4, parse_search_page
+from title_filter import TitleClassifier
+from description_extractor import DescriptionExtractor
+from search_state import SearchState
+from job_store import JobStore
+from ndjson_backup import append_jobs
+from sheet_repository import SheetRepository
+from duplicate_index import DuplicateIndex
 
 class LinkedInJobTracker:
-    def __init__(self, use_sheets=False, sheet_name="LinkedIn PM Jobs"):
+    def __init__(self, use_sheets=False, sheet_name="LinkedIn PM Jobs", http_client=None,
+                 description_cache=None, parser_backend='auto', job_store=None,
+                 title_filter=None, filter_on_parse=True, duplicate_index=None):
         self.base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.linkedin.com/jobs/',
-            'Cache-Control': 'no-cache, no-store, must-revalidate',
-            'Pragma': 'no-cache',
-        }
+        # Pooled keep-alive session (shared headers, retries, per-host rate limiting)
+        self.http = http_client or get_client()
+        # Local description cache, checked before any posting is fetched
+        self.description_cache = description_cache or DescriptionCache()
+        # Search page parser: 'auto', 'selectolax', 'lxml' or 'html.parser'
+        self.parser_backend = parser_backend
+        # Compiled include/exclude title rules; applied while cards are parsed so
+        # rejected roles are never built or have descriptions fetched
+        self.title_filter = title_filter or TitleClassifier()
+        self.filter_on_parse = filter_on_parse
         self.jobs = []
+        self.descriptions = {}  # job_id -> description text
+        self.extractor = DescriptionExtractor()
+        # Indexed local history of every job seen (backs the JSON backup)
+        self.store = job_store or JobStore()
+        # MinHash/LSH history linking reposts to their canonical posting
+        self.duplicates = duplicate_index or DuplicateIndex()
+        self.reposts = {}  # job_id -> canonical Job ID, for reposts found this run
+        # Watermarks for incremental searches (see search_many)
+        self.search_state = SearchState()
+        self._search_progress = {}
+        self._search_failed = set()  # Query keys with a page that failed to load
+        self._search_started = None
         self.use_sheets = use_sheets
         self.sheet_name = sheet_name
         self.sheet = None
+        self.sheet_repo = None
         
         if use_sheets:
             self._setup_google_sheets()
@@ -74,6 +97,8 @@ class LinkedInJobTracker:
                 print(f"✨ Created new Google Sheet: '{self.sheet_name}'")
                 print(f"🔗 Access it here: {self.spreadsheet.url}")
             
+            self.sheet_repo = SheetRepository(self.sheet)
+            
         except FileNotFoundError:
             print("❌ credentials.json not found!")
             print("📝 Please follow the setup guide to create credentials.")
@@ -91,279 +116,389 @@ class LinkedInJobTracker:
             location: Location filter - string only (e.g., "India" or "San Francisco, CA")
             num_jobs: Number of jobs to fetch (default: 50)
         """
-        # Ensure location is a single string (API ignores/breaks with list)
-        if isinstance(location, list):
-            location = location[0] if location else ""
+        return self.search_many([(keywords, location)], num_jobs=num_jobs, max_workers=1)
+    
+    def search_many(self, queries, num_jobs=50, max_workers=4, incremental=False, known_ratio=0.9):
+        """
+        Run several searches concurrently and merge the results
         
-        print(f"🔍 Searching for '{keywords}' jobs" + (f" in {location}" if location else "") + "...")
+        Args:
+            queries: List of (keywords, location) pairs
+            num_jobs: Number of jobs to fetch per query (default: 50)
+            max_workers: Number of page fetches in flight at once (default: 4)
+            incremental: Use per-query watermarks to skip already-seen jobs (default: False)
+            known_ratio: In incremental mode, stop paging a query once this share
+                of a page is already known (default: 0.9)
         
-        self.jobs = []
+        Pages of the same query are fetched in order (the next page is only
+        requested once the previous one came back full), but pages of different
+        queries run in parallel. Requests are paced by the HTTP client's
+        per-host token bucket.
+        Results are deduplicated by job_id (or link) as they arrive.
+        
+        In incremental mode the time window shrinks to the time since the
+        query's last successful run, and known jobs are left out of self.jobs.
+        Call commit_search_state() once the results are saved; a query with a
+        page that failed to load keeps its old watermark.
+        """
         jobs_per_page = 25
-        start = 0
+        run_started = time.time()
+        searches = []
+        for keywords, location in queries:
+            # Ensure location is a single string (API ignores/breaks with list)
+            if isinstance(location, list):
+                location = location[0] if location else ""
+            key = SearchState.key(keywords, location)
+            if incremental:
+                known = self.search_state.seen_ids(key)
+                window = self.search_state.time_window(key)
+            else:
+                known, window = set(), 'r604800'  # Past 7 days
+            searches.append((keywords, location, key, known, window))
+            print(f"🔍 Searching for '{keywords}' jobs" + (f" in {location}" if location else "") +
+                  (f" (window {window}, {len(known)} known)" if incremental else "") + "...")
+        
+        self.jobs = []
+        seen = set()
+        fetched = [0] * len(searches)
+        self._search_progress = {key: [] for _, _, key, _, _ in searches}
+        self._search_failed = set()
+        self._search_started = run_started
         
         try:
-            while len(self.jobs) < num_jobs:
-                params = {
-                    'keywords': keywords,
-                    'location': location,
-                    'start': start,
-                    'f_TPR': 'r604800',  # Past 7 days
-                }
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                pending = {}
+                for idx, (keywords, location, _, _, window) in enumerate(searches):
+                    future = pool.submit(self._fetch_search_page, keywords, location, 0, window)
+                    pending[future] = (idx, 0)
                 
-                response = requests.get(
-                    self.base_url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=15
-                )
-                
-                if response.status_code != 200:
-                    print(f"❌ Error: Status code {response.status_code}")
-                    break
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                job_cards = soup.find_all('li')
-                
-                if not job_cards:
-                    print(f"   No more results at start={start}")
-                    break
-                
-                page_count = 0
-                for card in job_cards:
-                    if len(self.jobs) >= num_jobs:
-                        break
-                    job_data = self._parse_job_card(card)
-                    if job_data:
-                        self.jobs.append(job_data)
-                        page_count += 1
-                
-                print(f"   Fetched page {start // jobs_per_page + 1}: +{page_count} jobs (total: {len(self.jobs)})")
-                
-                if page_count < jobs_per_page:
-                    break
-                
-                start += jobs_per_page
-                time.sleep(2)  # Rate limiting between pages
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        idx, start = pending.pop(future)
+                        keywords, location, key, known, window = searches[idx]
+                        page_jobs = future.result()
+                        if page_jobs is None:
+                            self._search_failed.add(key)
+                            continue
+                        
+                        if not page_jobs:
+                            print(f"   [{keywords} / {location or 'any'}] No more results at start={start}")
+                            continue
+                        
+                        added = 0
+                        already_known = 0
+                        rejected = 0
+                        for job_data in page_jobs:
+                            if fetched[idx] >= num_jobs:
+                                break
+                            fetched[idx] += 1
+                            if job_data is None:  # Title rejected by the filter while parsing
+                                rejected += 1
+                                continue
+                            self._search_progress[key].append(job_data.job_id)
+                            if job_data.job_id in known:
+                                already_known += 1
+                                continue
+                            job_key = job_data.job_id or job_data.link
+                            if job_key in seen:
+                                continue
+                            seen.add(job_key)
+                            self.jobs.append(job_data)
+                            added += 1
+                        
+                        print(f"   [{keywords} / {location or 'any'}] Fetched page {start // jobs_per_page + 1}: "
+                              f"+{added} new jobs (total: {len(self.jobs)})" +
+                              (f", {rejected} titles filtered out" if rejected else ""))
+                        
+                        accepted = len(page_jobs) - rejected
+                        if incremental and accepted and already_known >= known_ratio * accepted:
+                            print(f"   [{keywords} / {location or 'any'}] Page is {already_known}/{accepted} "
+                                  f"already seen, stopping")
+                            continue
+                        
+                        if len(page_jobs) >= jobs_per_page and fetched[idx] < num_jobs:
+                            next_start = start + jobs_per_page
+                            future = pool.submit(self._fetch_search_page, keywords, location, next_start, window)
+                            pending[future] = (idx, next_start)
             
             print(f"✅ Found {len(self.jobs)} jobs")
             return self.jobs
                 
         except Exception as e:
             print(f"❌ Error fetching jobs: {str(e)}")
+            self._search_failed = set(self._search_progress)
             return []
     
-    def _parse_job_card(self, card):
-        """Extract job information from a job card"""
+    def commit_search_state(self):
+        """
+        Record the last search as successful (advances the incremental
+        watermarks). Queries with a page that failed to load are left as
+        they were, so the next run searches their window again.
+        """
+        if not self._search_progress:
+            return
+        for key, job_ids in self._search_progress.items():
+            if key in self._search_failed:
+                print(f"⚠️  Search '{key}' had failed pages; its watermark is unchanged")
+                continue
+            self.search_state.record(key, job_ids, self._search_started)
+        self.search_state.save()
+        self._search_progress = {}
+        self._search_failed = set()
+    
+    def _fetch_search_page(self, keywords, location, start, time_window='r604800'):
+        """
+        Fetch and parse one page of search results.
+        Returns a list of job dicts, or None if the request failed.
+        """
+        params = {
+            'keywords': keywords,
+            'location': location,
+            'start': start,
+            'f_TPR': time_window,  # e.g. r604800 = past 7 days
+        }
+        
         try:
-            # Find job title and link
-            title_elem = card.find('h3', class_='base-search-card__title')
-            link_elem = card.find('a', class_='base-card__full-link')
-            company_elem = card.find('h4', class_='base-search-card__subtitle')
-            location_elem = card.find('span', class_='job-search-card__location')
+            response = self.http.get(self.base_url, params=params, timeout=15)
             
-            if not title_elem or not link_elem:
+            if response.status_code != 200:
+                print(f"❌ Error: Status code {response.status_code} ('{keywords}', start={start})")
                 return None
             
-            job_title = title_elem.text.strip()
-            job_link = link_elem.get('href', '').split('?')[0]  # Clean URL
-            company = company_elem.text.strip() if company_elem else "Unknown"
-            location = location_elem.text.strip() if location_elem else "Unknown"
-            
-            # Extract job ID from URL (format: .../jobs/view/title-company-1234567890)
-            job_id_match = re.search(r'-(\d+)(?:\?|$)', job_link) or re.search(r'/(\d+)(?:\?|$)', job_link)
-            job_id = job_id_match.group(1) if job_id_match else None
-            
-            return {
-                'job_id': job_id,
-                'title': job_title,
-                'company': company,
-                'location': location,
-                'link': job_link,
-                'found_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'status': 'New',
-                'notes': ''
-            }
-            
+            return parse_search_page(response.text, backend=self.parser_backend,
+                                     title_filter=self.title_filter if self.filter_on_parse else None)
+        
         except Exception as e:
-            print(f"⚠️  Error parsing job card: {str(e)}")
+            print(f"❌ Error fetching jobs: {str(e)}")
             return None
     
+    def _parse_job_card(self, card):
+        """Extract job information from a job card (BeautifulSoup element); None if filtered out"""
+        job_data = parse_card_bs4(card, self.title_filter if self.filter_on_parse else None)
+        return None if job_data is REJECTED else job_data
+    
     def fetch_job_description(self, job_id):
         """
         Fetch full job description from LinkedIn's job posting API (no login required).
         Returns text including Job Overview, What You Will Do, Skills, etc.
         """
+        return self._fetch_job_description(job_id)[2]
+    
+    def _fetch_job_description(self, job_id, max_retries=None):
+        """
+        Fetch a job posting and extract its description, going through the
+        description cache first (fresh entries skip the network, stale ones
+        are revalidated with ETag/Last-Modified).
+        Returns (status_code, body_length, description, from_cache);
+        status_code is None on network errors.
+        """
         if not job_id:
-            return None
+            return None, 0, None, False
+        cached = self.description_cache.get(job_id) if self.description_cache else None
+        if cached and cached['fresh'] and cached['text']:
+            return 200, len(cached['text']), cached['text'], True
         try:
             url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-            response = requests.get(url, headers=self.headers, timeout=15)
-            if response.status_code != 200:
-                return None
+            headers = self.description_cache.conditional_headers(cached) if cached else {}
+            response = self.http.get(url, max_retries=max_retries, headers=headers, timeout=15)
+            if response.status_code == 304 and cached and cached['text']:
+                self.description_cache.touch(job_id)
+                return 200, len(cached['text']), cached['text'], True
             html = response.text
-            if not html or len(html) < 500:
-                return None
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Try common LinkedIn description containers (class names may vary)
-            desc_div = (
-                soup.find('div', class_='description__text') or
-                soup.find('div', class_='show-more-less-html__markup') or
-                soup.find('section', class_='description') or
-                soup.find('div', class_='job-view-layout jobs-details')
-            )
-            if desc_div:
-                text = desc_div.get_text(strip=True, separator='\n')
-                if len(text) >= 100:
-                    return text
-            
-            # Fallback: extract from full page text between known markers
-            full_text = soup.get_text(separator='\n', strip=True)
-            end_pattern = r'(?:Show more|Seniority level|Employment type|Job function|Industries|Referrals|Featured Benefits)'
-            for start in ['Job Description', 'Job Overview', 'About the job']:
-                match = re.search(
-                    f'({re.escape(start)}).*?(?={end_pattern})',
-                    full_text,
-                    re.DOTALL | re.IGNORECASE
+            if response.status_code != 200:
+                return response.status_code, len(html), None, False
+            description = self._extract_description(html)
+            if description and self.description_cache:
+                self.description_cache.put(
+                    job_id, html, description,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
                 )
-                if match:
-                    text = match.group(0).strip()
-                    if len(text) >= 200:
-                        return text
-            
-            # Last resort: get body text if it looks like job content
-            body = soup.find('body')
-            if body:
-                text = body.get_text(strip=True, separator='\n')
-                if len(text) >= 500 and any(kw in text.lower() for kw in ['responsibilities', 'experience', 'product', 'skills']):
-                    return text
-            return None
+            return response.status_code, len(html), description, False
+        except Exception:
+            return None, 0, None, False
+    
+    def _extract_description(self, html):
+        """Extract description text from a job posting page"""
+        try:
+            return self.extractor.extract(html)
         except Exception:
             return None
     
+    def fetch_descriptions(self, jobs=None, max_workers=8, max_fetches=None):
+        """
+        Fetch job descriptions concurrently (stored in self.descriptions by job_id).
+        
+        Concurrency adapts while running: it grows while LinkedIn answers with
+        full pages and halves on 429s or suspiciously short responses.
+        
+        Args:
+            jobs: Jobs to fetch descriptions for (default: self.jobs)
+            max_workers: Upper bound on parallel fetches (default: 8)
+            max_fetches: Optional cap on fetches per run (default: no cap)
+        
+        Returns the number of descriptions fetched.
+        """
+        jobs = self.jobs if jobs is None else jobs
+        pending = [
+            job for job in jobs
+            if job.job_id and job.job_id not in self.descriptions
+        ]
+        if max_fetches is not None:
+            pending = pending[:max_fetches]
+        if not pending:
+            return 0
+        
+        print(f"📝 Fetching descriptions for {len(pending)} jobs (up to {max_workers} in parallel)...")
+        limiter = AdaptiveLimiter(initial=2, maximum=max_workers)
+        started = time.perf_counter()
+        
+        def fetch(job):
+            limiter.acquire()
+            throttled = False
+            try:
+                status, length, description, from_cache = self._fetch_job_description(job.job_id, max_retries=1)
+                # 429s and near-empty pages (under the 500-char sanity check) both mean LinkedIn is pushing back
+                throttled = not from_cache and (status == 429 or (status == 200 and length < 500))
+                if description:
+                    self.descriptions[job.job_id] = description
+                else:
+                    print(f"      ⚠ No description for {job.title[:40]} (status {status})")
+                return bool(description), from_cache
+            finally:
+                limiter.release(throttled)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(fetch, pending))
+        fetched = sum(got for got, _ in results)
+        # Only descriptions downloaded from LinkedIn count towards the rate; cache hits cost no request
+        downloaded = sum(got and not from_cache for got, from_cache in results)
+        
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        print(f"   ✓ Got {fetched}/{len(pending)} descriptions in {elapsed:.1f}s "
+              f"({fetched - downloaded} from cache, {downloaded} downloaded at "
+              f"{downloaded / elapsed * 60:.1f} descriptions/min, "
+              f"peak concurrency {limiter.peak}, final {limiter.limit})")
+        return fetched
+    
     def filter_product_management(self):
         """Filter jobs to only include product management related roles"""
-        pm_keywords = [
-            'product manager',
-            'product management',
-            'product owner',
-            'product lead',
-            'group product manager',
-            'senior product manager',
-            'principal product manager',
-            'associate product manager',
-            'apm',
-            'gpm',
-            'spm',
-            'head of product',
-            'director of product',
-            'vp product',
-            'chief product officer'
+        # Titles were already counted when they were filtered during parsing
+        filtered_jobs = [
+            job for job in self.jobs
+            if self.title_filter.matches(job.title, count=not self.filter_on_parse)
         ]
         
-        filtered_jobs = []
-        for job in self.jobs:
-            title_lower = job['title'].lower()
-            if any(keyword in title_lower for keyword in pm_keywords):
-                filtered_jobs.append(job)
-        
         print(f"🎯 Filtered to {len(filtered_jobs)} product management roles")
         self.jobs = filtered_jobs
         return filtered_jobs
     
-    def save_to_sheets(self, fetch_descriptions=True, max_description_fetches=20):
+    def save_to_sheets(self, fetch_descriptions=True, max_description_fetches=None):
         """
         Save jobs to Google Sheets.
-        fetch_descriptions: If True, fetches job descriptions via LinkedIn API
-        max_description_fetches: Limit fetches per run to avoid rate limits (default 20)
+        fetch_descriptions: If True, fetches descriptions for new jobs via fetch_descriptions()
+        max_description_fetches: Optional cap on fetches per run (default: fetch all new jobs)
+        Returns True if the sheet was updated.
         """
         if not self.use_sheets or not self.sheet:
             print("❌ Google Sheets not configured")
-            return
+            return False
         
         try:
+            # Job ID and Link index from the last run if the sheet still matches it, else one snapshot
+            repo = self.sheet_repo.ensure_index()
+            
             # Ensure Description column exists (for existing sheets)
-            existing_data = self.sheet.get_all_values()
-            headers = existing_data[0] if existing_data else []
-            if 'Description' not in headers:
-                desc_col = len(headers) + 1
-                self.sheet.update_cell(1, desc_col, 'Description')
+            if repo.column('Description') is None:
+                repo.ensure_column('Description')
                 print("   Added Description column to sheet")
             
-            existing_ids = set()
-            if len(existing_data) > 1:
-                for row in existing_data[1:]:
-                    if row and row[0]:
-                        existing_ids.add(str(row[0]))
-                    if len(row) > 4 and row[4]:
-                        existing_ids.add(row[4])
+            new_jobs = [
+                job for job in self.jobs
+                if not repo.contains(job.job_id, job.link)
+            ]
+            
+            if fetch_descriptions:
+                self.fetch_descriptions(new_jobs, max_fetches=max_description_fetches)
+                # Reposts of a tracked posting (confirmed from the description) get no row
+                new_jobs = self.drop_reposts(new_jobs)
             
             # Prepare new rows (with descriptions)
-            new_rows = []
-            fetch_count = 0
-            for job in self.jobs:
-                job_id = job.get('job_id') or job.get('link', '')
-                if job_id not in existing_ids and job.get('link') not in existing_ids:
-                    description = ''
-                    if fetch_descriptions and job.get('job_id') and fetch_count < max_description_fetches:
-                        print(f"   Fetching description for {job.get('title', '')[:40]}...")
-                        description = self.fetch_job_description(job['job_id']) or ''
-                        fetch_count += 1
-                        if description:
-                            print(f"      ✓ Got {len(description)} chars")
-                        else:
-                            print(f"      ⚠ No description")
-                        time.sleep(2)  # Rate limiting
-                    
-                    row = [
-                        job['job_id'],
-                        job['title'],
-                        job['company'],
-                        job['location'],
-                        job['link'],
-                        job['found_date'],
-                        job['status'],
-                        job['notes'],
-                        description
-                    ]
-                    new_rows.append(row)
+            new_rows = [
+                job.to_sheet_row(self.descriptions.get(job.job_id, ''))
+                for job in new_jobs
+            ]
             
             if new_rows:
-                self.sheet.append_rows(new_rows)
+                repo.append_rows(new_rows)
                 print(f"📊 Added {len(new_rows)} new jobs to Google Sheets")
                 print(f"🔗 View your sheet: {self.spreadsheet.url}")
             else:
                 print("ℹ️  No new jobs to add (all jobs already in sheet)")
             
-            total_jobs = len(self.sheet.get_all_values()) - 1
-            print(f"📈 Total jobs tracked: {total_jobs}")
+            repo.flush()
+            # Keep the saved Job ID -> row index in step with the appended rows (used by Agent 2)
+            repo.save_index()
+            print(f"📈 Total jobs tracked: {repo.total_rows}")
+            print(repo.summary())
+            return True
             
         except Exception as e:
             print(f"❌ Error saving to Google Sheets: {str(e)}")
+            return False
+    
+    def drop_reposts(self, jobs):
+        """
+        Jobs that are not reposts of an earlier posting. Each fetched
+        description is indexed and those that are near-duplicates (MinHash)
+        of a posting seen before are dropped; jobs without a description are
+        kept. Reposts are recorded in self.reposts (job_id -> canonical Job ID).
+        """
+        kept = []
+        for job in jobs:
+            if not job.job_id:
+                kept.append(job)
+                continue
+            description = self.descriptions.get(job.job_id)
+            canonical = self.duplicates.link(job.job_id, job.company, job.title, job.location,
+                                             description) if description else job.job_id
+            if canonical and canonical != job.job_id:
+                self.reposts[job.job_id] = canonical
+            else:
+                kept.append(job)
+        if len(kept) < len(jobs):
+            print(f"🔁 Skipped {len(jobs) - len(kept)} reposts of jobs already tracked")
+        return kept
     
-    def save_to_json(self, filename='linkedin_jobs.json'):
-        """Save jobs to a JSON file (backup)"""
+    def save_to_json(self, filename='linkedin_jobs.json', fmt=None):
+        """
+        Save jobs to a backup file.
+        
+        fmt='json' (default for .json files): merge the existing backup into
+        the local job store, upsert this run's jobs and rewrite the backup
+        from the store when there are new ones. The merge means a missing or
+        stale store (e.g. a partial cache restore) never shrinks the backup.
+        fmt='ndjson' (default for .ndjson files): append new jobs to an
+        append-only NDJSON file, deduplicated through a side index of seen
+        IDs; history is never re-read or rewritten.
+        """
+        fmt = fmt or ('ndjson' if filename.endswith('.ndjson') else 'json')
         try:
-            # Load existing jobs if file exists
-            existing_jobs = []
-            try:
-                with open(filename, 'r') as f:
-                    existing_jobs = json.load(f)
-            except FileNotFoundError:
-                pass
+            if fmt == 'ndjson':
+                new_jobs = append_jobs(filename, self.jobs)
+                print(f"💾 Appended {len(new_jobs)} new jobs to {filename} (backup)")
+                return
             
-            # Merge with new jobs (avoid duplicates by job_id or link)
-            existing_ids = {str(j.get('job_id')) for j in existing_jobs if j.get('job_id')}
-            existing_links = {j.get('link') for j in existing_jobs if j.get('link')}
-            new_jobs = [
-                job for job in self.jobs
-                if job.get('job_id') not in existing_ids and job.get('link') not in existing_links
-            ]
-            
-            all_jobs = existing_jobs + new_jobs
+            # The backup is the source of truth; the store may be missing jobs it holds
+            if os.path.exists(filename):
+                imported = self.store.import_json(filename)
+                if imported:
+                    print(f"📥 Added {imported} jobs from {filename} missing in the job store")
             
-            with open(filename, 'w') as f:
-                json.dump(all_jobs, f, indent=2)
+            new_jobs = self.store.upsert_many(self.jobs)
+            if new_jobs or not os.path.exists(filename):
+                self.store.export(filename)
             
             print(f"💾 Saved {len(new_jobs)} new jobs to {filename} (backup)")
             
@@ -380,11 +515,11 @@ class LinkedInJobTracker:
         print("-" * 80)
         
         for i, job in enumerate(self.jobs, 1):
-            print(f"{i}. {job['title']}")
-            print(f"   Company: {job['company']}")
-            print(f"   Location: {job['location']}")
-            print(f"   Link: {job['link']}")
-            print(f"   Found: {job['found_date']}")
+            print(f"{i}. {job.title}")
+            print(f"   Company: {job.company}")
+            print(f"   Location: {job.location}")
+            print(f"   Link: {job.link}")
+            print(f"   Found: {job.found_date}")
             print("-" * 80)
 
 
@@ -408,11 +543,14 @@ def main():
     )
     
     # Search for jobs
-    # Customize: location must be a single string (e.g. "India", "Bangalore", "Remote")
-    tracker.search_jobs(
-        keywords="product manager",
-        location="India",
-        num_jobs=100   # Number of jobs to fetch
+    # Customize: add (keywords, location) pairs to cover more titles and cities.
+    # Location must be a single string (e.g. "India", "Bangalore", "Remote")
+    tracker.search_many(
+        queries=[
+            ("product manager", "India"),
+        ],
+        num_jobs=100,   # Number of jobs to fetch per query
+        incremental=True   # Only look at jobs posted since the last run
     )
     
     # Filter for product management roles
@@ -422,12 +560,22 @@ def main():
     tracker.print_jobs()
     
     # Save to Google Sheets (if configured)
-    if use_sheets and tracker.sheet:
-        tracker.save_to_sheets()
+    saved_to_sheets = tracker.save_to_sheets() if use_sheets else True
     
     # Always save to JSON as backup
     tracker.save_to_json('linkedin_pm_jobs.json')
     
+    # Results are saved, so the next run can skip what this one saw
+    if saved_to_sheets:
+        tracker.commit_search_state()
+    else:
+        print("⚠️  Search state not saved; the next run will search these jobs again")
+    
+    print(tracker.http.summary())
+    print(tracker.description_cache.summary())
+    print(tracker.extractor.summary())
+    print(tracker.title_filter.summary())
+    print(tracker.duplicates.summary())
     print("\n✅ Job search complete!")
     if use_sheets and tracker.sheet:
         print(f"🔗 View your Google Sheet: {tracker.spreadsheet.url}")
@@ -0,0 +1,195 @@
+"""
+On-disk cache of LLM responses for Agent 2
+SQLite store keyed by (kind, model, prompt version, normalized input), with an
+optional near-duplicate lookup for reposted job descriptions
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_LLM_CACHE_PATH = os.path.join('.cache', 'llm_responses.sqlite3')
+
+FINGERPRINT_BITS = 64
+BANDS = 4  # 16-bit bands: fingerprints within 3 bits share at least one band exactly
+
+
+def normalize_text(text):
+    """Lowercase and collapse whitespace so formatting changes don't miss the cache"""
+    return re.sub(r'\s+', ' ', (text or '').lower()).strip()
+
+
+def fingerprint(text, shingle_size=3):
+    """
+    64-bit SimHash of word shingles. Reposts of the same job (minor edits,
+    different tracking text) land within a few bits of each other.
+    """
+    words = re.findall(r'\w+', normalize_text(text))
+    if len(words) < shingle_size:
+        words = words + [''] * (shingle_size - len(words))
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in shingles
+    ]
+    half = len(hashes) / 2
+    value = 0
+    for bit in range(FINGERPRINT_BITS):
+        if sum((h >> bit) & 1 for h in hashes) > half:
+            value |= 1 << bit
+    return value
+
+
+def _bands(value):
+    width = FINGERPRINT_BITS // BANDS
+    return [(value >> (i * width)) & ((1 << width) - 1) for i in range(BANDS)]
+
+
+class LLMCache:
+    """
+    Persistent cache of parsed LLM outputs (analysis JSON, cover-letter text).
+
+    Entries are keyed by a SHA-256 of kind, model, prompt version and the
+    normalized input, stored as zlib-compressed JSON, and expire after
+    ttl_days. Once the cache grows past max_bytes the least recently used
+    entries are dropped.
+
+    With near_duplicate=True a miss falls back to any entry of the same
+    kind/model/version whose SimHash fingerprint is within max_distance bits.
+    """
+    def __init__(self, path=DEFAULT_LLM_CACHE_PATH, ttl_days=30,
+                 max_bytes=50 * 1024 * 1024, max_distance=3):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                kind TEXT,
+                model TEXT,
+                prompt_version TEXT,
+                fingerprint TEXT,
+                {', '.join(f'band{i} INTEGER' for i in range(BANDS))},
+                payload BLOB,
+                created_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        ''')
+        for i in range(BANDS):
+            self.conn.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_responses_band{i} ON responses(kind, model, prompt_version, band{i})'
+            )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)')
+        self.conn.commit()
+        self.evict()
+
+    @staticmethod
+    def key(kind, model, prompt_version, text):
+        payload = '\x1f'.join([kind, model, prompt_version, normalize_text(text)])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, kind, model, prompt_version, text, near_duplicate=False, peek=False):
+        """
+        Return the cached value for this input, or None.
+        peek=True looks without counting a hit/miss or refreshing the entry.
+        """
+        now = time.time()
+        key = self.key(kind, model, prompt_version, text)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT key, payload FROM responses WHERE key = ? AND created_at >= ?',
+                (key, now - self.ttl)
+            ).fetchone()
+            near = False
+            if row is None and near_duplicate:
+                row = self._nearest(kind, model, prompt_version, fingerprint(text), now)
+                near = row is not None
+            if not peek:
+                if row is None:
+                    self.misses += 1
+                elif near:
+                    self.near_hits += 1
+                else:
+                    self.hits += 1
+            if row is None:
+                return None
+            if not peek:
+                self.conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, row[0]))
+                self.conn.commit()
+        return json.loads(zlib.decompress(row[1]).decode('utf-8'))
+
+    def _nearest(self, kind, model, prompt_version, value, now):
+        bands = _bands(value)
+        where = ' OR '.join(f'band{i} = ?' for i in range(BANDS))
+        rows = self.conn.execute(
+            f'SELECT key, payload, fingerprint FROM responses '
+            f'WHERE kind = ? AND model = ? AND prompt_version = ? AND created_at >= ? AND ({where})',
+            [kind, model, prompt_version, now - self.ttl] + bands
+        ).fetchall()
+        best, best_distance = None, self.max_distance + 1
+        for key, payload, stored in rows:
+            distance = bin(int(stored, 16) ^ value).count('1')
+            if distance < best_distance:
+                best, best_distance = (key, payload), distance
+        return best
+
+    def put(self, kind, model, prompt_version, text, value):
+        """Store (or replace) the value for this input"""
+        now = time.time()
+        blob = zlib.compress(json.dumps(value).encode('utf-8'), 6)
+        value_fingerprint = fingerprint(text)
+        with self._lock:
+            self.conn.execute(
+                f'INSERT OR REPLACE INTO responses '
+                f'(key, kind, model, prompt_version, fingerprint, '
+                f'{", ".join(f"band{i}" for i in range(BANDS))}, payload, created_at, accessed_at, size) '
+                f'VALUES ({", ".join("?" for _ in range(BANDS + 9))})',
+                [self.key(kind, model, prompt_version, text), kind, model, prompt_version,
+                 f'{value_fingerprint:016x}'] + _bands(value_fingerprint) + [blob, now, now, len(blob)]
+            )
+            self.conn.commit()
+            self._puts += 1
+            due = self._puts % 200 == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        with self._lock:
+            self.conn.execute('DELETE FROM responses WHERE created_at < ?', (time.time() - self.ttl,))
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total > self.max_bytes:
+                rows = self.conn.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall()
+                doomed = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self.conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+            self.conn.commit()
+
+    def summary(self):
+        """One-line summary of cache hits and misses"""
+        return f"🧠 LLM cache: {self.hits} hits, {self.near_hits} near-duplicate hits, {self.misses} misses"
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,63 @@
+"""
+Vectorized match scoring for many jobs at once
+Same 40/30/30 weighting as ResumeCustomizer.calculate_match_score
+"""
+
+import numpy as np
+
+SKILLS_WEIGHT = 40
+KEYWORDS_WEIGHT = 30
+SENIORITY_WEIGHT = 30
+
+RANKED_DTYPE = np.dtype([('index', np.int64), ('score', np.int64)])
+
+
+def score_many(analyses, resume_index):
+    """
+    Score every analysis against a ResumeIndex in one vectorized pass.
+
+    All phrases are collected into one term vocabulary and matched against
+    the resume once. Skills and keywords become sparse job x term incidence
+    lists (row, term) and per-job hit counts are summed with bincount.
+
+    Returns a structured array of (index, score) sorted by score, highest
+    first; ties keep input order. Scores equal calculate_match_score's.
+    """
+    analyses = list(analyses)
+    if not analyses:
+        return np.empty(0, dtype=RANKED_DTYPE)
+
+    vocabulary = {}
+    skill_rows, skill_terms = [], []
+    keyword_rows, keyword_terms = [], []
+    seniority_terms = []
+    for row, analysis in enumerate(analyses):
+        for skill in analysis['required_skills']:
+            skill_rows.append(row)
+            skill_terms.append(vocabulary.setdefault(skill, len(vocabulary)))
+        for keyword in analysis['keywords']:
+            keyword_rows.append(row)
+            keyword_terms.append(vocabulary.setdefault(keyword, len(vocabulary)))
+        seniority_terms.append(vocabulary.setdefault(analysis['seniority'], len(vocabulary)))
+
+    found = resume_index.match(vocabulary)
+    hits = np.zeros(len(vocabulary), dtype=np.float64)
+    hits[[term for phrase, term in vocabulary.items() if found[phrase]]] = 1.0
+
+    n = len(analyses)
+    scores = np.zeros(n, dtype=np.float64)
+    for rows, terms, weight in ((skill_rows, skill_terms, SKILLS_WEIGHT),
+                                (keyword_rows, keyword_terms, KEYWORDS_WEIGHT)):
+        rows = np.asarray(rows, dtype=np.int64)
+        terms = np.asarray(terms, dtype=np.int64)
+        totals = np.bincount(rows, minlength=n)
+        matched = np.bincount(rows, weights=hits[terms], minlength=n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores += np.where(totals > 0, matched / totals * weight, 0.0)
+    scores += hits[np.asarray(seniority_terms, dtype=np.int64)] * SENIORITY_WEIGHT
+
+    scores = scores.astype(np.int64)  # int() truncation, scores are never negative
+    ranked = np.empty(n, dtype=RANKED_DTYPE)
+    ranked['index'] = np.argsort(-scores, kind='stable')
+    ranked['score'] = scores[ranked['index']]
+    return ranked
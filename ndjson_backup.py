@@ -0,0 +1,82 @@
+"""
+Append-only NDJSON job backup
+One JSON object per line, a side index of seen keys, and a streaming reader
+"""
+
+import json
+import os
+
+
+def index_path(filename):
+    """Side index of seen job IDs and links, one per line"""
+    return filename + '.ids'
+
+
+def iter_jobs(filename):
+    """
+    Yield jobs from a backup one at a time.
+    NDJSON files are streamed line by line; a legacy JSON list is loaded once.
+    """
+    with open(filename, 'r') as f:
+        if not filename.endswith('.ndjson'):
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _as_dict(job):
+    return job.to_dict() if hasattr(job, 'to_dict') else job
+
+
+def _job_keys(job):
+    keys = []
+    if job.get('job_id'):
+        keys.append(str(job['job_id']))
+    if job.get('link'):
+        keys.append(job['link'])
+    return keys
+
+
+def load_seen_keys(filename):
+    """
+    Load the side index as a set. If it is missing but the backup exists,
+    rebuild it with one streaming pass over the backup.
+    """
+    try:
+        with open(index_path(filename), 'r') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+    except FileNotFoundError:
+        pass
+
+    seen = set()
+    if os.path.exists(filename):
+        for job in iter_jobs(filename):
+            seen.update(_job_keys(job))
+        with open(index_path(filename), 'w') as f:
+            f.writelines(key + '\n' for key in seen)
+    return seen
+
+
+def append_jobs(filename, jobs):
+    """
+    Append jobs not seen before (by job_id or link) to the NDJSON backup.
+    Existing lines are never rewritten. Returns the list of appended jobs.
+    """
+    seen = load_seen_keys(filename)
+    new_jobs = []
+    for job in jobs:
+        keys = _job_keys(job)
+        if any(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        new_jobs.append(job)
+
+    if new_jobs:
+        with open(filename, 'a') as f:
+            f.writelines(json.dumps(_as_dict(job)) + '\n' for job in new_jobs)
+        with open(index_path(filename), 'a') as f:
+            f.writelines(key + '\n' for job in new_jobs for key in _job_keys(job))
+    return new_jobs
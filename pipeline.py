@@ -0,0 +1,98 @@
+"""
+Staged pipeline executor
+Items flow through a sequence of stages, each with its own bounded worker pool
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Pipeline:
+    """
+    Run items through stages concurrently.
+
+    Each stage is a function that takes an item and returns the item for the
+    next stage, or None to drop it. Every stage has its own thread pool, so a
+    slow stage (e.g. LLM calls) only limits itself while other items move
+    through the faster stages. Per-stage counts and busy time are kept in
+    self.stats.
+    """
+    def __init__(self):
+        self.stages = []
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, func, workers=1):
+        self.stages.append((name, func, max(1, workers)))
+        self.stats[name] = {'items': 0, 'dropped': 0, 'errors': 0, 'seconds': 0.0}
+        return self
+
+    def run(self, items):
+        """Push every item through all stages; returns the outputs of the last stage"""
+        items = list(items)
+        if not items or not self.stages:
+            return []
+
+        executors = [
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            for name, _, workers in self.stages
+        ]
+        results = []
+        remaining = [len(items)]
+        finished = threading.Event()
+
+        def finish(output):
+            with self._lock:
+                if output is not None:
+                    results.append(output)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    finished.set()
+
+        def execute(stage_idx, item):
+            name, func, _ = self.stages[stage_idx]
+            started = time.perf_counter()
+            try:
+                output = func(item)
+                error = False
+            except Exception as e:
+                print(f"❌ [{name}] {str(e)}")
+                output, error = None, True
+            with self._lock:
+                stats = self.stats[name]
+                stats['items'] += 1
+                stats['seconds'] += time.perf_counter() - started
+                if error:
+                    stats['errors'] += 1
+                elif output is None:
+                    stats['dropped'] += 1
+
+            if output is None or stage_idx == len(self.stages) - 1:
+                finish(output)
+            else:
+                submit(stage_idx + 1, output)
+
+        def submit(stage_idx, item):
+            executors[stage_idx].submit(execute, stage_idx, item)
+
+        try:
+            for item in items:
+                submit(0, item)
+            finished.wait()
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+        return results
+
+    def summary(self):
+        """Multi-line summary of per-stage throughput"""
+        lines = ["⏱️  Pipeline stages:"]
+        for name, _, workers in self.stages:
+            stats = self.stats[name]
+            avg = stats['seconds'] / stats['items'] if stats['items'] else 0
+            lines.append(
+                f"   {name:10s} {stats['items']:4d} items, {stats['dropped']} dropped, "
+                f"{stats['errors']} errors, avg {avg:.2f}s ({workers} workers)"
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,60 @@
+"""
+Local pre-screen of job descriptions before LLM analysis
+Applies a threshold to the semantic fit between a description and the master
+resume (semantic_index.SemanticMatcher), the same score used to rank jobs
+"""
+
+import threading
+
+
+class FitScreen:
+    """
+    Keeps jobs whose semantic fit to the resume is at least threshold.
+
+    Fit comes from the shared SemanticMatcher, so a job already embedded
+    (by ranking or the describe step) is read from its vector index instead
+    of being embedded again. passes() counts each job once, keyed by Job ID
+    (or the description for jobs without one), however often it is asked.
+
+    If the matcher could not read the resume, every fit would be 0 and
+    every job would be dropped, so the screen is disabled instead.
+    """
+    def __init__(self, matcher, threshold=0.10):
+        self.matcher = matcher
+        self.threshold = threshold
+        self.enabled = matcher.has_resume
+        self.results = {}  # key -> passed
+        self._lock = threading.Lock()
+        if not self.enabled:
+            print("⚠️  No readable text in the master resume for semantic fit; pre-screen disabled")
+
+    def passes(self, job_id, description):
+        """(passed, fit) for a job description; always passes when the screen is disabled"""
+        fit = self.matcher.fit(job_id, description)
+        passed = fit >= self.threshold or not self.enabled
+        with self._lock:
+            self.results[job_id or description] = passed
+        return passed, fit
+
+    @property
+    def screened(self):
+        return len(self.results)
+
+    @property
+    def skipped(self):
+        return sum(not passed for passed in self.results.values())
+
+    def summary(self, seconds_per_call=None):
+        """One-line summary of jobs screened and skipped, with the LLM time they saved"""
+        if not self.enabled:
+            return "🧹 Pre-screen: disabled (no readable resume text)"
+        if not self.screened:
+            return "🧹 Pre-screen: no jobs screened"
+        skipped = self.skipped
+        line = (f"🧹 Pre-screen: {skipped} of {self.screened} jobs skipped "
+                f"below semantic fit {self.threshold:.2f}")
+        if skipped and seconds_per_call:
+            line += f", ~{skipped * seconds_per_call:.0f}s of LLM analysis saved"
+        elif skipped:
+            line += f", {skipped} LLM calls saved"
+        return line
@@ -0,0 +1,141 @@
+"""
+Pre-processed master resume for match scoring
+Loaded once per process and reloaded when the file's mtime changes
+"""
+
+import os
+import re
+import threading
+from collections import deque
+
+from docx import Document
+
+MAX_NGRAM = 3
+
+_cache = {}  # path -> (mtime, ResumeIndex)
+_cache_lock = threading.Lock()
+
+
+def tokenize(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def word_ngrams(text, max_n=MAX_NGRAM):
+    """Every run of 1..max_n consecutive words, as it appears in text (separators included)"""
+    spans = [match.span() for match in re.finditer(r'\w+', text)]
+    return {
+        text[spans[i][0]:spans[i + n - 1][1]]
+        for n in range(1, max_n + 1)
+        for i in range(len(spans) - n + 1)
+    }
+
+
+class PhraseMatcher:
+    """
+    Aho–Corasick automaton over a set of phrases: one scan of a text finds
+    every phrase that occurs in it as a substring.
+    """
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for i, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.out[state].append(i)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text):
+        """Set of phrases that occur in text"""
+        found = set(self.out[0])  # The empty phrase matches anything
+        remaining = len(self.phrases) - len(found)
+        state = 0
+        for ch in text:
+            if not remaining:
+                break
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for i in self.out[state]:
+                if i not in found:
+                    found.add(i)
+                    remaining -= 1
+        return {self.phrases[i] for i in found}
+
+
+class ResumeIndex:
+    """
+    Lowercased resume text plus its token set and word n-grams (up to
+    MAX_NGRAM words, kept verbatim so each one is a substring of the text). contains() keeps the exact semantics of
+    `phrase.lower() in text.lower()`; results are memoized per phrase, and
+    phrases not seen before are matched together in one Aho–Corasick scan.
+    """
+    def __init__(self, text):
+        self.text = text.lower()
+        self.tokens = set(tokenize(self.text))
+        self.ngrams = word_ngrams(self.text)
+        self._known = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_docx(cls, path):
+        """Index a .docx resume ('' if it cannot be read)"""
+        try:
+            text = '\n'.join([p.text for p in Document(path).paragraphs])
+        except Exception:
+            text = ''
+        return cls(text)
+
+    def match(self, phrases):
+        """Map each phrase to whether it occurs in the resume (case-insensitive substring)"""
+        lowered = {phrase: phrase.lower() for phrase in phrases}
+        with self._lock:
+            unknown = set()
+            for phrase in set(lowered.values()):
+                if phrase in self._known:
+                    continue
+                if phrase in self.ngrams:
+                    self._known[phrase] = True  # Cheap hit: a verbatim word n-gram of the text
+                else:
+                    unknown.add(phrase)
+            if unknown:
+                found = PhraseMatcher(unknown).find(self.text)
+                for phrase in unknown:
+                    self._known[phrase] = phrase in found
+            return {phrase: self._known[low] for phrase, low in lowered.items()}
+
+    def contains(self, phrase):
+        return self.match([phrase])[phrase]
+
+
+def load_resume_index(path):
+    """Shared ResumeIndex for path, rebuilt only when the file changes"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    index = ResumeIndex.from_docx(path)
+    with _cache_lock:
+        _cache[path] = (mtime, index)
+    return index
@@ -0,0 +1,168 @@
+"""
+Checkpoint journal for resumable Agent 2 runs
+SQLite (WAL) record of how far each job got, and the results of each step,
+so a rerun picks up where the last one stopped
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+DEFAULT_JOURNAL_PATH = os.path.join('.cache', 'agent2_journal.sqlite3')
+
+# Steps in order; a job's state is the last one it completed
+STATES = ('described', 'analyzed', 'scored', 'rendered', 'synced')
+_RANK = {state: i for i, state in enumerate(STATES)}
+
+
+# Steps whose results depend on the master resume
+RESUME_STEPS = ('scored', 'rendered', 'synced')
+
+
+def reached(state, step):
+    """True if a job in state has completed step"""
+    return state is not None and _RANK[state] >= _RANK[step]
+
+
+def file_version(path):
+    """Content hash of a file ('' if it cannot be read), to tell when it was edited"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+class RunJournal:
+    """
+    Per-job state machine: described -> analyzed -> scored -> rendered -> synced.
+
+    advance() merges a step's results into the job's saved fields and moves
+    its state forward (never back), so replaying a step is harmless.
+    load() returns the state and fields for resuming a job. Jobs that were
+    rendered but never synced are listed by pending('rendered') so their
+    sheet updates can be sent together.
+
+    Each row records the resume_version (see file_version) it was saved
+    under. Once the master resume changes, a job that was scored under an
+    older version counts as only analyzed, so it is scored and rendered
+    again. restart() forgets synced jobs whose sheet row was reset.
+    """
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, resume_version=''):
+        self.path = path
+        self.resume_version = resume_version
+        self.resumed = Counter()
+        self.outdated = 0
+        self.restarted = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                state TEXT,
+                fields TEXT,
+                resume_version TEXT,
+                updated_at REAL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state)')
+        self.conn.commit()
+
+    def _current(self, state, resume_version):
+        """A saved state, moved back to analyzed if it was scored under another resume"""
+        if state in RESUME_STEPS and resume_version != self.resume_version:
+            return 'analyzed'
+        return state
+
+    def load(self, job_id, resume=True):
+        """
+        (state, fields) saved for a job, or (None, {}) if it has no checkpoint.
+        resume=False only reads them (not counted as a resumed job).
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT state, fields, resume_version FROM jobs WHERE job_id = ?', (str(job_id),)
+            ).fetchone()
+        if row is None:
+            return None, {}
+        state = self._current(row[0], row[2])
+        if resume:
+            with self._lock:
+                self.resumed[state] += 1
+                self.outdated += state != row[0]
+        return state, json.loads(row[1])
+
+    def advance(self, job_id, state, **fields):
+        """Record that a job completed state, saving fields with its earlier ones"""
+        job_id = str(job_id)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT state, fields, resume_version FROM jobs WHERE job_id = ?', (job_id,)
+            ).fetchone()
+            saved = json.loads(row[1]) if row else {}
+            saved.update(fields)
+            if row and reached(self._current(row[0], row[2]), state):
+                state = self._current(row[0], row[2])
+            self.conn.execute(
+                'INSERT OR REPLACE INTO jobs (job_id, state, fields, resume_version, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (job_id, state, json.dumps(saved), self.resume_version, time.time())
+            )
+            self.conn.commit()
+
+    def mark_synced(self, job_ids):
+        """Move jobs to synced in one transaction"""
+        job_ids = [(self.resume_version, time.time(), str(job_id)) for job_id in job_ids]
+        if not job_ids:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE jobs SET state = 'synced', resume_version = ?, updated_at = ? WHERE job_id = ?", job_ids
+            )
+            self.conn.commit()
+
+    def restart(self, job_ids):
+        """
+        Forget synced jobs so they run from the start again (their sheet row
+        was reset to New after they were synced). Returns how many were reset.
+        """
+        with self._lock:
+            cursor = self.conn.executemany(
+                "DELETE FROM jobs WHERE job_id = ? AND state = 'synced'", [(str(job_id),) for job_id in job_ids]
+            )
+            self.conn.commit()
+            self.restarted += cursor.rowcount
+        return cursor.rowcount
+
+    def pending(self, state):
+        """{job_id: fields} of jobs whose last completed step is state"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT job_id, fields, resume_version FROM jobs WHERE state = ?', (state,)
+            ).fetchall()
+        return {job_id: json.loads(fields) for job_id, fields, version in rows
+                if self._current(state, version) == state}
+
+    def summary(self):
+        """One-line summary of jobs resumed from a checkpoint"""
+        redone = "".join([
+            f", {self.outdated} rescored after a resume change" if self.outdated else "",
+            f", {self.restarted} reset in the sheet and redone" if self.restarted else "",
+        ])
+        if not self.resumed:
+            return "📒 Checkpoints: no jobs resumed" + redone
+        steps = ", ".join(f"{self.resumed[state]} {state}" for state in STATES if self.resumed[state])
+        return f"📒 Checkpoints: {sum(self.resumed.values())} jobs resumed ({steps})" + redone
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,68 @@
+"""
+Per-query search watermarks for incremental tracker runs
+Remembers which job IDs each query already returned and when it last ran
+"""
+
+import json
+import os
+import time
+
+DEFAULT_STATE_PATH = os.path.join('.cache', 'search_state.json')
+MAX_WINDOW = 604800  # Past 7 days, the widest window the tracker asks for
+
+
+class SearchState:
+    """
+    Watermarks stored as JSON: {query_key: {'seen': [job_id, ...], 'last_run': epoch}}.
+    Only the newest max_ids_per_query IDs are kept per query.
+    """
+    def __init__(self, path=DEFAULT_STATE_PATH, max_ids_per_query=5000):
+        self.path = path
+        self.max_ids_per_query = max_ids_per_query
+        self.queries = {}
+        try:
+            with open(path, 'r') as f:
+                self.queries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable search state {path}: {str(e)}")
+
+    @staticmethod
+    def key(keywords, location):
+        return f"{keywords.strip().lower()}|{(location or '').strip().lower()}"
+
+    def seen_ids(self, key):
+        return set(self.queries.get(key, {}).get('seen', []))
+
+    def time_window(self, key, margin=3600, minimum=3600):
+        """
+        LinkedIn f_TPR value covering everything since the last successful run
+        (plus a safety margin), rounded up to whole hours and capped at 7 days.
+        """
+        last_run = self.queries.get(key, {}).get('last_run')
+        if not last_run:
+            return f"r{MAX_WINDOW}"
+        seconds = time.time() - last_run + margin
+        seconds = int(-(-seconds // 3600) * 3600)
+        return f"r{max(minimum, min(MAX_WINDOW, seconds))}"
+
+    def record(self, key, job_ids, run_started):
+        """Add job IDs to a query's watermark and move its last-run time forward"""
+        entry = self.queries.setdefault(key, {'seen': [], 'last_run': None})
+        known = set(entry['seen'])
+        for job_id in job_ids:
+            if job_id and job_id not in known:
+                known.add(job_id)
+                entry['seen'].append(job_id)
+        entry['seen'] = entry['seen'][-self.max_ids_per_query:]
+        entry['last_run'] = run_started
+
+    def save(self):
+        """Write the state atomically (temp file + rename)"""
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.queries, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,258 @@
+"""
+Offline semantic matching between the master resume and job descriptions
+CPU-only embeddings (hashing vectorizer, or a local sentence-transformers model
+when installed) stored in a memory-mapped vector index
+
+Usage:
+    python semantic_index.py top --k 20           # jobs closest to the resume
+    python semantic_index.py bullets JOB_ID --k 3   # resume bullets closest to a job
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from docx import Document
+
+DEFAULT_INDEX_PATH = os.path.join('.cache', 'job_vectors')
+
+STOPWORDS = set("""
+a an and are as at be by for from has have in is it its of on or our that the their this to
+we will with you your who what which while within across about into over under more most
+""".split())
+
+
+def _tokens(text):
+    return [t for t in re.findall(r'[a-z0-9][a-z0-9+#/.-]*', (text or '').lower()) if t not in STOPWORDS]
+
+
+class HashingEmbedder:
+    """
+    Signed feature hashing of words and word bigrams with sublinear term
+    frequency, L2-normalized. Needs no training data and no model download.
+    """
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f'hashing-{dim}'
+
+    def _bucket(self, feature):
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'little')
+        return value % self.dim, (1.0 if value >> 63 else -1.0)
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _tokens(text)
+            counts = {}
+            for feature in tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]:
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                bucket, sign = self._bucket(feature)
+                vectors[row, bucket] += sign * (1.0 + np.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class SentenceTransformerEmbedder:
+    """Small local transformer model (e.g. all-MiniLM-L6-v2), run on CPU"""
+    def __init__(self, model_name='all-MiniLM-L6-v2'):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device='cpu')
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f'st-{model_name}'
+
+    def embed(self, texts):
+        return self.model.encode(list(texts), normalize_embeddings=True).astype(np.float32)
+
+
+def default_embedder(model_name=None):
+    """A local transformer model if one is requested and installed, else hashing"""
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            print(f"⚠️  Semantic model {model_name} unavailable ({str(e)}), using hashing vectorizer")
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """
+    Append-only matrix of unit vectors on disk, read through np.memmap.
+
+    Files: <path>.f32 (rows of float32), <path>.ids (one ID per line) and
+    <path>.json (dimension and embedder name). An index written by a
+    different embedder is discarded and rebuilt.
+    """
+    def __init__(self, path=DEFAULT_INDEX_PATH, dim=1024, embedder_name=''):
+        self.path = path
+        self.dim = dim
+        self.ids = []
+        self.rows = {}
+        self._matrix = None
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta = {'dim': dim, 'embedder': embedder_name}
+        try:
+            with open(path + '.json', 'r') as f:
+                valid = json.load(f) == meta
+        except (FileNotFoundError, ValueError):
+            valid = False
+        if not valid:
+            for suffix in ('.f32', '.ids'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            with open(path + '.json', 'w') as f:
+                json.dump(meta, f)
+            return
+
+        try:
+            with open(path + '.ids', 'r') as f:
+                self.ids = [line.rstrip('\n') for line in f if line.strip()]
+        except FileNotFoundError:
+            pass
+        stored = os.path.getsize(path + '.f32') // (4 * dim) if os.path.exists(path + '.f32') else 0
+        if stored != len(self.ids):
+            # An interrupted append: keep only rows that have both a vector and an ID
+            self.ids = self.ids[:min(stored, len(self.ids))]
+            with open(path + '.f32', 'ab') as f:
+                f.truncate(len(self.ids) * 4 * dim)
+            with open(path + '.ids', 'w') as f:
+                f.writelines(job_id + '\n' for job_id in self.ids)
+        self.rows = {job_id: row for row, job_id in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return str(item_id) in self.rows
+
+    @property
+    def matrix(self):
+        with self._lock:
+            if self._matrix is None and self.ids:
+                self._matrix = np.memmap(self.path + '.f32', dtype=np.float32, mode='r',
+                                         shape=(len(self.ids), self.dim))
+            return self._matrix
+
+    def add(self, ids, vectors):
+        """Append vectors for IDs not already indexed. Returns the number added."""
+        with self._lock:
+            new = [(str(item_id), vector) for item_id, vector in zip(ids, vectors)
+                   if str(item_id) not in self.rows]
+            if not new:
+                return 0
+            with open(self.path + '.f32', 'ab') as f:
+                for _, vector in new:
+                    f.write(np.asarray(vector, dtype=np.float32).tobytes())
+            with open(self.path + '.ids', 'a') as f:
+                f.writelines(item_id + '\n' for item_id, _ in new)
+            for item_id, _ in new:
+                self.rows[item_id] = len(self.ids)
+                self.ids.append(item_id)
+            self._matrix = None
+            return len(new)
+
+    def vector(self, item_id):
+        row = self.rows.get(str(item_id))
+        return None if row is None else np.array(self.matrix[row])
+
+    def top_k(self, query, k=10):
+        """[(id, cosine similarity)] of the k nearest vectors, best first"""
+        matrix = self.matrix
+        if matrix is None:
+            return []
+        scores = matrix @ np.asarray(query, dtype=np.float32)
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.ids[i], float(scores[i])) for i in best]
+
+
+class SemanticMatcher:
+    """
+    Resume <-> job similarity without API calls.
+
+    The resume is split into bullets (non-trivial paragraphs); their
+    normalized mean is the resume vector. Job descriptions are embedded once
+    and kept in a VectorIndex keyed by Job ID. has_resume is False when no
+    bullets could be read, in which case every fit is 0.
+    """
+    def __init__(self, resume_path, embedder=None, index_path=DEFAULT_INDEX_PATH):
+        self.embedder = embedder or default_embedder()
+        self.index = VectorIndex(index_path, self.embedder.dim, self.embedder.name)
+        self.bullets = self._resume_bullets(resume_path)
+        self.bullet_vectors = self.embedder.embed(self.bullets) if self.bullets else \
+            np.zeros((0, self.embedder.dim), dtype=np.float32)
+        resume = self.bullet_vectors.sum(axis=0)
+        norm = np.linalg.norm(resume)
+        self.has_resume = bool(norm)
+        self.resume_vector = resume / norm if norm else resume
+
+    @staticmethod
+    def _resume_bullets(path, min_length=20):
+        try:
+            paragraphs = [p.text.strip() for p in Document(path).paragraphs]
+        except Exception:
+            return []
+        return [text for text in paragraphs if len(text) >= min_length]
+
+    def embed_job(self, job_id, description):
+        """Vector for a job, from the index if present, else embedded and stored"""
+        vector = self.index.vector(job_id) if job_id else None
+        if vector is None:
+            vector = self.embedder.embed([description])[0]
+            if job_id:
+                self.index.add([job_id], [vector])
+        return vector
+
+    def fit(self, job_id, description):
+        """Cosine similarity between the resume and a job description"""
+        return float(self.embed_job(job_id, description) @ self.resume_vector)
+
+    def nearest_jobs(self, k=20):
+        """[(job_id, similarity)] of indexed jobs closest to the resume"""
+        return self.index.top_k(self.resume_vector, k)
+
+    def nearest_bullets(self, description=None, k=3, job_id=None):
+        """[(bullet, similarity)] of resume bullets closest to a job"""
+        if not self.bullets:
+            return []
+        query = self.index.vector(job_id) if job_id else None
+        if query is None:
+            query = self.embedder.embed([description or ''])[0]
+        scores = self.bullet_vectors @ query
+        best = np.argsort(-scores, kind='stable')[:k]
+        return [(self.bullets[i], float(scores[i])) for i in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local semantic job index")
+    parser.add_argument('command', choices=['top', 'bullets'])
+    parser.add_argument('job_id', nargs='?', help="Job ID (for bullets)")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--resume', default='resume_master.docx')
+    parser.add_argument('--model', default=None, help="sentence-transformers model name (optional)")
+    args = parser.parse_args()
+
+    matcher = SemanticMatcher(args.resume, default_embedder(args.model))
+    if args.command == 'top':
+        print(f"🔍 {len(matcher.index)} jobs indexed; closest to the resume:")
+        for job_id, score in matcher.nearest_jobs(args.k):
+            print(f"   {score:.3f}  {job_id}")
+    else:
+        if args.job_id not in matcher.index:
+            print(f"❌ Job {args.job_id} is not in the index")
+            return
+        for bullet, score in matcher.nearest_bullets(job_id=args.job_id, k=args.k):
+            print(f"   {score:.3f}  {bullet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Batched Google Sheets access for the job tracker and Agent 2
+One snapshot per run, an in-memory Job ID index, and queued cell writes
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from gspread.utils import rowcol_to_a1
+
+from job_record import JobRecord
+
+DEFAULT_INDEX_PATH = os.path.join('.cache', 'sheet_index.json')
+
+
+class SheetRepository:
+    """
+    Wraps a gspread worksheet so a run reads it once and writes it in bulk.
+
+    snapshot() downloads all values once and indexes rows by Job ID (column A)
+    and Link (column E). Cell writes are queued and sent together by flush()
+    in a single batch_update call. api_calls counts every request made.
+
+    The Job ID -> row index (and the set of links) can be saved to disk and
+    reloaded by a later run. A reload is checked against a checksum of the
+    header, the row count and the last Job ID, which costs one small range
+    read instead of a snapshot. Without a snapshot, cell() reads a row from
+    the sheet the first time one of its cells is asked for.
+    """
+    ID_COLUMN = 1
+    LINK_COLUMN = 5
+
+    def __init__(self, worksheet):
+        self.sheet = worksheet
+        self.header = []
+        self.rows = []
+        self.row_count = 0
+        self.loaded = False
+        self.row_index = {}  # Job ID -> sheet row number (1-based, header is row 1)
+        self.links = set()
+        self.api_calls = 0
+        self._fetched_rows = {}  # row number -> values read by cell() outside the snapshot
+        self._pending = {}  # (row, col) -> value; later writes to the same cell win
+        self._lock = threading.RLock()
+
+    def snapshot(self):
+        """Download the whole sheet once and rebuild the indexes"""
+        with self._lock:
+            values = self.sheet.get_all_values()
+            self.api_calls += 1
+            self.header = values[0] if values else []
+            self.rows = values[1:]
+            self.row_count = len(self.rows)
+            self.loaded = True
+            self.row_index = {}
+            self.links = set()
+            self._fetched_rows = {}
+            for offset, row in enumerate(self.rows):
+                self._index_row(offset + 2, row)
+        return self
+
+    def _index_row(self, row_number, row):
+        if len(row) >= self.ID_COLUMN and row[self.ID_COLUMN - 1]:
+            self.row_index.setdefault(str(row[self.ID_COLUMN - 1]), row_number)
+        if len(row) >= self.LINK_COLUMN and row[self.LINK_COLUMN - 1]:
+            self.links.add(row[self.LINK_COLUMN - 1])
+
+    @property
+    def total_rows(self):
+        """Number of data rows (excluding the header)"""
+        return self.row_count
+
+    def _last_id(self):
+        for job_id, row_number in self.row_index.items():
+            if row_number == self.row_count + 1:
+                return job_id
+        return ''
+
+    @staticmethod
+    def _checksum(header, row_count, last_id):
+        header = list(header)
+        while header and not header[-1]:
+            header.pop()  # Range reads drop trailing blanks that get_all_values() pads
+        payload = json.dumps([header, row_count, last_id])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def save_index(self, path=DEFAULT_INDEX_PATH):
+        """Persist the Job ID -> row index with a checksum for cheap revalidation"""
+        with self._lock:
+            data = {
+                'checksum': self._checksum(self.header, self.row_count, self._last_id()),
+                'header': self.header,
+                'row_count': self.row_count,
+                'row_index': self.row_index,
+                'links': sorted(self.links),
+            }
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load_index(self, path=DEFAULT_INDEX_PATH):
+        """
+        Load a saved row index if the sheet still matches it.
+        Reads only the header row and the cells around the last data row.
+        Returns True if the index was loaded.
+        """
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        if 'links' not in data:
+            return False  # Saved before links were included
+
+        last_row = data['row_count'] + 1
+        header_range, tail_range = self.sheet.batch_get(['1:1', f'A{last_row}:A{last_row + 1}'])
+        self.api_calls += 1
+        header = header_range[0] if header_range else []
+        tail = [row[0] if row else '' for row in tail_range]
+        last_id = tail[0] if tail and data['row_count'] else ''
+        # A value right after the last known row means rows were added elsewhere
+        if (len(tail) > 1 and tail[1]) or \
+                self._checksum(header, data['row_count'], last_id) != data['checksum']:
+            return False
+
+        with self._lock:
+            self.header = header
+            self.rows = []
+            self.row_count = data['row_count']
+            self.row_index = data['row_index']
+            self.links = set(data['links'])
+            self._fetched_rows = {}
+            self.loaded = True
+        return True
+
+    def ensure_index(self, path=DEFAULT_INDEX_PATH):
+        """Make the row index available: in memory, from disk if still valid, else a snapshot"""
+        if self.loaded:
+            return self
+        if not self.load_index(path):
+            self.snapshot()
+            self.save_index(path)
+        return self
+
+    def records(self):
+        """Rows as dicts keyed by header, like get_all_records() but from the snapshot"""
+        with self._lock:
+            return [
+                {name: (row[i] if i < len(row) else '') for i, name in enumerate(self.header)}
+                for row in self.rows
+            ]
+
+    def job_records(self, status=None):
+        """
+        Rows as JobRecords, built straight from the snapshot without
+        intermediate dicts. status keeps only rows with that Status
+        (case-insensitive).
+        """
+        with self._lock:
+            col = self.column('Status')
+            wanted = status.lower() if status else None
+            return [
+                JobRecord.from_sheet_row(row, self.header)
+                for row in self.rows
+                if wanted is None or (col and col <= len(row) and row[col - 1].lower() == wanted)
+            ]
+
+    def contains(self, job_id=None, link=None):
+        """True if a row with this Job ID or Link already exists"""
+        return bool((job_id and str(job_id) in self.row_index) or (link and link in self.links))
+
+    def row_for(self, job_id):
+        """Sheet row number for a Job ID, or None"""
+        return self.row_index.get(str(job_id))
+
+    def column(self, name):
+        """1-based column number for a header name, or None"""
+        return self.header.index(name) + 1 if name in self.header else None
+
+    def _row(self, row_number):
+        """Values of a row from the snapshot, or read from the sheet once if it isn't in it"""
+        if 2 <= row_number < len(self.rows) + 2:
+            return self.rows[row_number - 2]
+        if row_number not in self._fetched_rows:
+            self._fetched_rows[row_number] = self.sheet.row_values(row_number)
+            self.api_calls += 1
+        return self._fetched_rows[row_number]
+
+    def cell(self, row_number, col):
+        """Value of a cell (including queued writes)"""
+        with self._lock:
+            if (row_number, col) in self._pending:
+                return self._pending[(row_number, col)]
+            row = self._row(row_number)
+            return row[col - 1] if col - 1 < len(row) else ''
+
+    def ensure_column(self, name):
+        """Return the column for a header, queueing a new header cell if missing"""
+        with self._lock:
+            col = self.column(name)
+            if col is None:
+                self.header.append(name)
+                col = len(self.header)
+                self._pending[(1, col)] = name
+            return col
+
+    def queue_update(self, row_number, col, value):
+        """Queue a single-cell write and apply it to the snapshot"""
+        with self._lock:
+            self._pending[(row_number, col)] = value
+            row = self.rows[row_number - 2] if 2 <= row_number < len(self.rows) + 2 \
+                else self._fetched_rows.get(row_number)
+            if row is not None:
+                if len(row) < col:
+                    row.extend([''] * (col - len(row)))
+                row[col - 1] = value
+
+    def append_rows(self, rows):
+        """Append rows in one request and extend the indexes"""
+        if not rows:
+            return
+        with self._lock:
+            self.sheet.append_rows(rows)
+            self.api_calls += 1
+            for row in rows:
+                row = ['' if value is None else str(value) for value in row]
+                self.row_count += 1
+                if len(self.rows) == self.row_count - 1:
+                    self.rows.append(row)
+                self._index_row(self.row_count + 1, row)
+
+    def flush(self):
+        """
+        Send every queued write in a single batch_update call.
+        Adjacent cells in the same row are merged into one range.
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            data = []
+            for (row_number, col), value in sorted(self._pending.items()):
+                last = data[-1] if data else None
+                if last and last['row'] == row_number and last['end'] == col - 1:
+                    last['values'][0].append(value)
+                    last['end'] = col
+                else:
+                    data.append({'row': row_number, 'start': col, 'end': col, 'values': [[value]]})
+            self.sheet.batch_update([
+                {
+                    'range': rowcol_to_a1(d['row'], d['start']) + (
+                        ':' + rowcol_to_a1(d['row'], d['end']) if d['end'] > d['start'] else ''),
+                    'values': d['values'],
+                }
+                for d in data
+            ], value_input_option='USER_ENTERED')
+            self.api_calls += 1
+            count = len(self._pending)
+            self._pending = {}
+            return count
+
+    def summary(self):
+        return f"📊 Sheets API calls this run: {self.api_calls}"
@@ -4,6 +4,8 @@ Test resume customization without Google Sheets
 """
 
 import os
+import shutil
+import tempfile
 from agent_2_resume_customizer import ResumeCustomizer
 
 def test_agent_2():
@@ -51,10 +53,12 @@ Nice to have:
     print(f"   Company: {sample_job['Company']}")
     print(f"   Description: {len(sample_description)} characters")
     
-    # Initialize Agent 2 (without Google Sheets)
+    # Initialize Agent 2 (without Google Sheets), keeping its caches out of ./.cache
+    cache_dir = tempfile.mkdtemp(prefix='agent2_test_cache_')
     customizer = ResumeCustomizer(
         master_resume_path="resume_master.docx",
-        use_sheets=False
+        use_sheets=False,
+        cache_dir=cache_dir
     )
     
     # Test AI analysis
@@ -146,6 +150,8 @@ Nice to have:
         print("\n🎉 Agent 2 is working! Ready to process real jobs.")
     else:
         print("\n⚠️  Some tests failed. Check errors above.")
+    
+    shutil.rmtree(cache_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+"""
+Batch analysis tests
+Parsing and offline replay of a recorded Batch API output file
+"""
+
+import json
+import os
+
+from batch_analysis import RecordedBatchRunner, batch_request, parse_batch_output
+
+RECORDED = os.path.join(os.path.dirname(__file__), 'fixtures', 'batch_output.jsonl')
+
+
+def test_parse_batch_output_maps_failures_to_none():
+    usage = {}
+    with open(RECORDED) as f:
+        results = parse_batch_output(f, usage)
+
+    assert json.loads(results['101'])['required_skills'] == ['SQL']
+    assert results['102'] is None  # Request-level error
+    assert results['103'] is None  # Non-200 response
+    assert usage == {'101': 57, '999': 55}
+
+
+def test_recorded_runner_answers_by_custom_id():
+    runner = RecordedBatchRunner(RECORDED)
+    requests = [batch_request(job_id, model='gpt-4o-mini', messages=[]) for job_id in ('101', '102', '103', '104')]
+    results = runner.run(requests)
+
+    assert list(results) == ['101', '102', '103', '104']
+    assert results['101'] is not None
+    assert results['104'] is None  # Requested but not in the recording
+    assert '999' not in results  # Recorded but not requested
+    assert runner.usage['101'] == 57
+
+
+def test_batch_request_line():
+    request = batch_request(42, model='gpt-4o-mini', messages=[{'role': 'user', 'content': 'hi'}])
+    assert request == {
+        'custom_id': '42', 'method': 'POST', 'url': '/v1/chat/completions',
+        'body': {'model': 'gpt-4o-mini', 'messages': [{'role': 'user', 'content': 'hi'}]},
+    }
@@ -0,0 +1,33 @@
+"""
+DOCX renderer tests
+Rendered resumes and cover letters must reopen as valid Word documents
+"""
+
+from datetime import datetime
+
+from docx import Document
+
+from docx_renderer import CoverLetterRenderer, ResumeRenderer, cover_letter_paragraphs
+
+
+def test_cover_letter_drops_characters_xml_cannot_hold(tmp_path):
+    letter = "Dear Hiring Manager,\x0b\n\nI led\x00 A/B testing\tand SQL analytics.\ufffe"
+    output = str(tmp_path / 'letter.docx')
+    paragraphs = cover_letter_paragraphs('Product Manager', 'Acme', letter, date=datetime(2024, 1, 2))
+    CoverLetterRenderer().render(paragraphs, output)
+
+    text = '\n'.join(p.text for p in Document(output).paragraphs)
+    assert 'Re: Application for Product Manager' in text
+    assert 'Dear Hiring Manager,\n' in text
+    assert 'I led A/B testing\tand SQL analytics.' in text
+    assert '\x0b' not in text and '\x00' not in text
+
+
+def test_resume_reopens_with_backed_strengths(tmp_path):
+    output = str(tmp_path / 'resume.docx')
+    analysis = {'required_skills': ['SQL', 'Kubernetes'], 'keywords': ['roadmap']}
+    ResumeRenderer('resume_master.docx').render(analysis, output)
+
+    text = '\n'.join(p.text for p in Document(output).paragraphs)
+    assert 'Key strengths for this role: SQL, roadmap.' in text
+    assert 'Kubernetes' not in text  # Not in the master resume, so never claimed
@@ -0,0 +1,67 @@
+"""
+Duplicate index tests
+MinHash/LSH linking of reposted jobs to their canonical posting
+"""
+
+import numpy as np
+
+from duplicate_index import DuplicateIndex, MinHasher, features
+
+DESCRIPTION = (
+    "We are looking for a Senior Product Manager to own the roadmap for our B2B SaaS analytics "
+    "platform. You will work with engineering, design and data science to define product strategy, "
+    "run A/B tests, track OKRs and manage stakeholders across sales and customer success. "
+    "Requirements: 5+ years of product management, strong SQL, experience shipping data products."
+)
+OTHER_DESCRIPTION = (
+    "Registered nurse needed for night shifts in our intensive care unit. Patient assessment, "
+    "medication administration, wound care and coordinating with physicians. BLS and ACLS "
+    "certification required, two years of ICU experience preferred."
+)
+
+
+def test_signature_is_deterministic_and_32_bit():
+    items = features('Acme', 'Product Manager', DESCRIPTION)
+    first, second = MinHasher().signature(items), MinHasher().signature(items)
+    assert first.dtype == np.uint32
+    assert np.array_equal(first, second)
+    assert int(first.max()) < (1 << 32) - 5
+
+
+def test_signature_estimates_jaccard_similarity():
+    hasher = MinHasher()
+    a = {f'item {i}' for i in range(100)}
+    b = {f'item {i}' for i in range(20, 120)}  # Jaccard 80/120
+    estimate = np.mean(hasher.signature(a) == hasher.signature(b))
+    assert abs(estimate - 80 / 120) < 0.15
+
+
+def test_link_returns_canonical_of_near_duplicate(tmp_path):
+    index = DuplicateIndex(str(tmp_path / 'duplicates.sqlite3'))
+    assert index.link('1', 'Acme', 'Product Manager', 'Bangalore', DESCRIPTION) == '1'
+    repost = 'Reposted. ' + DESCRIPTION + ' Apply now!'
+    assert index.link('2', 'Acme', 'Product Manager', 'Bangalore', repost) == '1'
+    # A repost of the repost still points at the first posting
+    assert index.link('3', 'Acme', 'Product Manager', 'Remote', repost + ' Hybrid.') == '1'
+    assert index.canonical('3') == '1'
+    assert index.reposts == 2
+
+
+def test_link_keeps_distinct_openings_with_the_same_header(tmp_path):
+    index = DuplicateIndex(str(tmp_path / 'duplicates.sqlite3'))
+    index.link('1', 'Acme', 'Product Manager', 'Bangalore', DESCRIPTION)
+    assert index.link('2', 'Acme', 'Product Manager', 'Bangalore', OTHER_DESCRIPTION) == '2'
+    assert index.reposts == 0
+
+
+def test_link_is_idempotent_and_persistent(tmp_path):
+    index = DuplicateIndex(str(tmp_path / 'duplicates.sqlite3'))
+    index.link('1', 'Acme', 'Product Manager', 'Bangalore', DESCRIPTION)
+    index.link('2', 'Acme', 'Product Manager', 'Bangalore', DESCRIPTION)
+    assert index.link('2', 'Acme', 'Product Manager', 'Bangalore', OTHER_DESCRIPTION) == '1'
+    assert index.checked == 2
+    index.close()
+
+    index = DuplicateIndex(str(tmp_path / 'duplicates.sqlite3'))
+    assert index.canonical('2') == '1'
+    assert index.link('4', 'Acme', 'Product Manager', 'Pune', DESCRIPTION) == '1'
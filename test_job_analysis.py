@@ -0,0 +1,50 @@
+"""
+Job analysis tests
+Validation and incremental parsing of streamed structured output
+"""
+
+import json
+
+import pytest
+
+from job_analysis import SCORING_FIELDS, AnalysisStreamParser, JobAnalysis
+
+ANALYSIS = {
+    'seniority': 'Senior',
+    'required_skills': ['SQL', 'A/B testing'],
+    'keywords': ['roadmap', 'stakeholders, {quoted} "braces"'],
+    'domain': 'SaaS',
+    'responsibilities': ['Own the roadmap', 'Run experiments'],
+}
+
+
+def test_stream_parser_completes_fields_as_they_arrive():
+    text = json.dumps(ANALYSIS)
+    parser = AnalysisStreamParser()
+    completed = []
+    for start in range(0, len(text), 7):
+        completed += parser.feed(text[start:start + 7])
+
+    assert completed == list(ANALYSIS)
+    assert parser.fields == ANALYSIS
+    assert parser.result() == ANALYSIS
+
+
+def test_stream_parser_scoring_fields_before_end():
+    text = json.dumps(ANALYSIS)
+    cut = text.index('"domain"')
+    parser = AnalysisStreamParser()
+    parser.feed(text[:cut])
+    assert parser.has(SCORING_FIELDS)
+    with pytest.raises(ValueError):
+        parser.result()  # Incomplete response
+
+
+def test_from_json_rejects_schema_mismatches():
+    with pytest.raises(ValueError):
+        JobAnalysis.from_json('{"seniority": "Senior"}')
+    with pytest.raises(ValueError):
+        JobAnalysis.from_json('not json')
+    analysis = JobAnalysis.from_json(json.dumps(dict(ANALYSIS, extra='ignored')))
+    assert analysis.keywords == ANALYSIS['keywords']
+    assert 'extra' not in analysis
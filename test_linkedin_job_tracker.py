@@ -0,0 +1,107 @@
+"""
+Job tracker tests
+Incremental search watermarks and the JSON backup, with a stand-in HTTP client (no network)
+"""
+
+import json
+
+from job_record import JobRecord
+from linkedin_job_tracker import LinkedInJobTracker
+from search_state import SearchState
+
+
+class Response:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+
+def search_page(start, count=25):
+    return ''.join(
+        f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+        f'<a class="base-card__full-link" href="https://in.linkedin.com/jobs/view/{job_id}"></a>'
+        f'<h3 class="base-search-card__title">Product Manager</h3>'
+        f'<h4 class="base-search-card__subtitle"><a>Acme</a></h4>'
+        f'<span class="job-search-card__location">Bangalore</span></div></li>'
+        for job_id in range(1000 + start, 1000 + start + count)
+    )
+
+
+class SearchClient:
+    """Serves full search pages, failing with 429 at the given start offsets"""
+    def __init__(self, failing_starts=()):
+        self.failing_starts = set(failing_starts)
+
+    def get(self, url, params=None, **kwargs):
+        if params['start'] in self.failing_starts:
+            return Response(429)
+        return Response(200, search_page(params['start']))
+
+
+def test_commit_advances_watermark_when_every_page_loaded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Caches and the job store live under ./.cache
+    t = LinkedInJobTracker(http_client=SearchClient(), filter_on_parse=False)
+    t.search_state = SearchState(str(tmp_path / 'search_state.json'))
+    t.search_many([('product manager', 'India')], num_jobs=50, incremental=True)
+    t.commit_search_state()
+
+    state = SearchState(str(tmp_path / 'search_state.json'))
+    assert state.queries['product manager|india']['last_run']
+    assert len(state.seen_ids('product manager|india')) == 50
+
+
+def test_failed_page_keeps_the_old_watermark(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    t = LinkedInJobTracker(http_client=SearchClient(failing_starts={25}), filter_on_parse=False)
+    t.search_state = SearchState(str(tmp_path / 'search_state.json'))
+    jobs = t.search_many([('product manager', 'India')], num_jobs=75, incremental=True)
+    t.commit_search_state()
+
+    assert len(jobs) == 25  # Only the first page came back
+    state = SearchState(str(tmp_path / 'search_state.json'))
+    assert 'product manager|india' not in state.queries
+    assert state.time_window('product manager|india') == 'r604800'
+
+
+def test_json_backup_keeps_jobs_missing_from_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backup = tmp_path / 'jobs.json'
+    backup.write_text(json.dumps([
+        {'job_id': str(job_id), 'title': 'Product Manager', 'company': 'Acme', 'location': 'Pune',
+         'link': f'https://in.linkedin.com/jobs/view/{job_id}', 'found_date': '2024-01-01',
+         'status': 'New', 'notes': ''}
+        for job_id in (1, 2, 3)
+    ]))
+    t = LinkedInJobTracker(http_client=SearchClient())  # Fresh store, as after a partial cache restore
+    t.store.upsert_many([{'job_id': '1', 'title': 'Product Manager', 'link': 'https://in.linkedin.com/jobs/view/1'}])
+    t.jobs = [JobRecord.new('4', 'Product Manager', 'Beta', 'Pune', 'https://in.linkedin.com/jobs/view/4')]
+
+    t.save_to_json(str(backup))
+
+    assert [job['job_id'] for job in json.loads(backup.read_text())] == ['1', '2', '3', '4']
+
+
+class PostingClient:
+    """Serves a job posting page for every description request"""
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        description = 'Own the roadmap for our analytics platform with engineering and design. ' * 10
+        return Response(200, f'<div class="description__text">{description}</div>')
+
+
+def test_fetch_rate_counts_only_downloaded_descriptions(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    client = PostingClient()
+    t = LinkedInJobTracker(http_client=client, filter_on_parse=False)
+    jobs = [JobRecord.new(str(job_id), 'Product Manager', 'Acme', 'Pune', f'https://in.linkedin.com/jobs/view/{job_id}')
+            for job_id in (1, 2, 3)]
+    for job in jobs[:2]:
+        t.description_cache.put(job.job_id, '<html></html>', 'Cached description')
+
+    assert t.fetch_descriptions(jobs) == 3
+    assert client.requests == 1
+    assert '(2 from cache, 1 downloaded at' in capsys.readouterr().out
@@ -0,0 +1,39 @@
+"""
+Match scoring tests
+Vectorized score_many must agree with ResumeCustomizer.calculate_match_score
+"""
+
+from agent_2_resume_customizer import ResumeCustomizer
+from match_scoring import score_many
+from resume_index import ResumeIndex
+
+RESUME = """Senior Product Manager
+Led A/B testing and SQL analytics for a B2B SaaS platform.
+Owned the roadmap and managed stakeholders across engineering, design and data science."""
+
+ANALYSES = [
+    {'seniority': 'Senior', 'required_skills': ['SQL', 'A/B testing', 'Kubernetes'],
+     'keywords': ['roadmap', 'OKRs', 'stakeholders']},
+    {'seniority': 'Director', 'required_skills': ['sql'], 'keywords': []},
+    {'seniority': 'senior', 'required_skills': [], 'keywords': ['SaaS', 'data science']},
+    {'seniority': 'Junior', 'required_skills': ['Rust', 'Go'], 'keywords': ['embedded']},
+    {'seniority': 'Senior', 'required_skills': ['SQL', 'SQL', 'Java'], 'keywords': ['B2B', 'Fintech', 'Design']},
+]
+
+
+def test_score_many_matches_calculate_match_score():
+    index = ResumeIndex(RESUME)
+    expected = [ResumeCustomizer.calculate_match_score(None, analysis, index) for analysis in ANALYSES]
+
+    ranked = score_many(ANALYSES, index)
+
+    assert sorted(ranked['index'].tolist()) == list(range(len(ANALYSES)))
+    assert {int(i): int(score) for i, score in ranked} == dict(enumerate(expected))
+    assert ranked['score'].tolist() == sorted(expected, reverse=True)
+
+
+def test_score_many_keeps_input_order_on_ties():
+    index = ResumeIndex(RESUME)
+    tied = [ANALYSES[3], ANALYSES[0], ANALYSES[3]]
+    assert score_many(tied, index)['index'].tolist() == [1, 0, 2]
+    assert len(score_many([], index)) == 0
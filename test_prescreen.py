@@ -0,0 +1,50 @@
+"""
+Pre-screen tests
+Semantic-fit threshold applied before LLM analysis
+"""
+
+from prescreen import FitScreen
+from semantic_index import SemanticMatcher
+
+
+class FixedMatcher:
+    """Stands in for SemanticMatcher with preset fits"""
+    def __init__(self, fits, has_resume=True):
+        self.fits = fits
+        self.has_resume = has_resume
+
+    def fit(self, job_id, description):
+        return self.fits[job_id or description]
+
+
+def test_passes_applies_threshold():
+    screen = FitScreen(FixedMatcher({'1': 0.3, '2': 0.05}), threshold=0.1)
+    assert screen.passes('1', 'PM role') == (True, 0.3)
+    assert screen.passes('2', 'Nurse role') == (False, 0.05)
+    assert (screen.screened, screen.skipped) == (2, 1)
+
+
+def test_each_job_is_counted_once():
+    screen = FitScreen(FixedMatcher({'1': 0.05, 'no id': 0.3}), threshold=0.1)
+    screen.passes('1', 'Nurse role')
+    screen.passes('1', 'Nurse role')  # Screened again by the pipeline after ranking
+    screen.passes(None, 'no id')
+    assert (screen.screened, screen.skipped) == (2, 1)
+    assert '1 of 2 jobs skipped' in screen.summary(seconds_per_call=4.0)
+
+
+def test_summary_without_jobs():
+    assert FitScreen(FixedMatcher({})).summary() == "🧹 Pre-screen: no jobs screened"
+
+
+def test_unreadable_resume_disables_the_screen():
+    screen = FitScreen(FixedMatcher({'1': 0.0}, has_resume=False), threshold=0.1)
+    assert screen.passes('1', 'PM role') == (True, 0.0)
+    assert screen.summary() == "🧹 Pre-screen: disabled (no readable resume text)"
+
+
+def test_semantic_matcher_flags_missing_resume(tmp_path):
+    matcher = SemanticMatcher(str(tmp_path / 'missing.docx'), index_path=str(tmp_path / 'vectors'))
+    assert not matcher.has_resume
+    assert matcher.fit(None, 'Product manager owning the roadmap') == 0.0
+    assert SemanticMatcher('resume_master.docx', index_path=str(tmp_path / 'vectors')).has_resume
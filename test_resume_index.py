@@ -0,0 +1,28 @@
+"""
+Resume index tests
+Phrase matching against the master resume keeps substring semantics
+"""
+
+from resume_index import PhraseMatcher, ResumeIndex
+
+RESUME = """Senior Product Manager
+Led A/B testing and SQL analytics for a B2B SaaS platform.
+Managed stakeholders across engineering, design and data science."""
+
+
+def test_match_is_case_insensitive_substring():
+    index = ResumeIndex(RESUME)
+    phrases = ['SQL', 'a/b testing', 'Data Science', 'stake', 'Kubernetes', 'science.', 'product roadmap']
+    assert index.match(phrases) == {phrase: phrase.lower() in RESUME.lower() for phrase in phrases}
+
+
+def test_contains_spans_punctuation_and_repeats():
+    index = ResumeIndex(RESUME)
+    assert index.contains('engineering, design')
+    assert index.contains('ENGINEERING, DESIGN')  # Answered from the memo
+    assert not index.contains('engineering design')
+
+
+def test_phrase_matcher_finds_overlapping_phrases():
+    matcher = PhraseMatcher(['he', 'she', 'his', 'hers'])
+    assert matcher.find('ushers') == {'he', 'she', 'hers'}
@@ -0,0 +1,101 @@
+"""
+Run journal tests
+Checkpoint state machine used to resume interrupted Agent 2 runs
+"""
+
+from run_journal import RunJournal, file_version, reached
+
+
+def test_reached_follows_step_order():
+    assert reached('scored', 'described')
+    assert reached('scored', 'scored')
+    assert not reached('scored', 'rendered')
+    assert not reached(None, 'described')
+
+
+def test_advance_merges_fields(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    journal.advance('1', 'described', description='PM role', fit=0.3)
+    journal.advance('1', 'analyzed', analysis={'keywords': ['roadmap']})
+
+    state, fields = journal.load('1')
+    assert state == 'analyzed'
+    assert fields == {'description': 'PM role', 'fit': 0.3, 'analysis': {'keywords': ['roadmap']}}
+
+
+def test_advance_never_moves_backward(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    journal.advance('1', 'scored', match_score=80)
+    journal.advance('1', 'described', fit=0.2)  # A replayed earlier step
+
+    state, fields = journal.load('1')
+    assert state == 'scored'
+    assert fields == {'match_score': 80, 'fit': 0.2}
+
+
+def test_pending_lists_jobs_by_last_step(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    journal.advance('1', 'rendered', resume_path='a.docx')
+    journal.advance('2', 'rendered', resume_path='b.docx')
+    journal.advance('3', 'scored', match_score=60)
+
+    assert journal.pending('rendered') == {'1': {'resume_path': 'a.docx'}, '2': {'resume_path': 'b.docx'}}
+    assert set(journal.pending('scored')) == {'3'}
+
+    journal.mark_synced(['1'])
+    assert set(journal.pending('rendered')) == {'2'}
+    assert journal.load('1')[0] == 'synced'
+
+
+def test_load_counts_resumed_jobs_and_survives_reopen(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    journal.advance(42, 'analyzed', analysis={})
+    journal.close()
+
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    assert journal.load('missing') == (None, {})
+    assert journal.load(42, resume=False) == ('analyzed', {'analysis': {}})
+    assert not journal.resumed
+    journal.load('42')
+    assert journal.resumed['analyzed'] == 1
+
+
+def test_resume_change_sends_scored_jobs_back_to_scoring(tmp_path):
+    path = str(tmp_path / 'journal.sqlite3')
+    journal = RunJournal(path, resume_version='v1')
+    journal.advance('1', 'analyzed', analysis={})
+    journal.advance('2', 'rendered', resume_path='b.docx')
+    journal.advance('3', 'rendered', resume_path='c.docx')
+    journal.mark_synced(['3'])
+    journal.close()
+
+    journal = RunJournal(path, resume_version='v2')
+    assert journal.load('1')[0] == 'analyzed'
+    assert journal.load('2')[0] == 'analyzed'
+    assert journal.load('3')[0] == 'analyzed'
+    assert journal.pending('rendered') == {}  # Not synced with documents from the old resume
+    assert journal.outdated == 2
+
+    journal.advance('3', 'scored', match_score=70)  # Rescored under v2, not left at synced
+    assert journal.load('3')[0] == 'scored'
+
+
+def test_restart_forgets_only_synced_jobs(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.sqlite3'))
+    journal.advance('1', 'rendered', resume_path='a.docx')
+    journal.advance('2', 'rendered', resume_path='b.docx')
+    journal.mark_synced(['1'])
+
+    assert journal.restart(['1', '2', 'missing']) == 1
+    assert journal.load('1') == (None, {})
+    assert journal.load('2')[0] == 'rendered'
+    assert 'reset in the sheet' in journal.summary()
+
+
+def test_file_version_tracks_content(tmp_path):
+    resume = tmp_path / 'resume.docx'
+    resume.write_bytes(b'one')
+    first = file_version(str(resume))
+    resume.write_bytes(b'two')
+    assert file_version(str(resume)) != first
+    assert file_version(str(tmp_path / 'missing.docx')) == ''
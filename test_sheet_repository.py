@@ -0,0 +1,117 @@
+"""
+Sheet repository tests
+Batched reads and writes against an in-memory stand-in for a gspread worksheet
+"""
+
+from gspread.utils import a1_to_rowcol
+
+from sheet_repository import SheetRepository
+
+HEADER = ['Job ID', 'Title', 'Company', 'Location', 'Link', 'Found Date', 'Status', 'Notes',
+          'Description', 'Match Score', 'Resume Path']
+
+
+class FakeWorksheet:
+    """The worksheet methods SheetRepository uses, over a list of rows"""
+    def __init__(self, values):
+        self.values = [list(row) for row in values]
+        self.calls = []
+
+    def get_all_values(self):
+        self.calls.append('get_all_values')
+        width = max((len(row) for row in self.values), default=0)
+        return [row + [''] * (width - len(row)) for row in self.values]
+
+    def row_values(self, row):
+        self.calls.append('row_values')
+        return list(self.values[row - 1]) if row <= len(self.values) else []
+
+    def batch_get(self, ranges):
+        self.calls.append('batch_get')
+        results = []
+        for a1 in ranges:
+            if a1 == '1:1':
+                header = list(self.values[0]) if self.values else []
+                while header and not header[-1]:
+                    header.pop()
+                results.append([header] if header else [])
+                continue
+            first, last = (int(cell[1:]) for cell in a1.split(':'))
+            column = [self.values[r - 1][0] if r <= len(self.values) and self.values[r - 1] else ''
+                      for r in range(first, last + 1)]
+            while column and not column[-1]:
+                column.pop()
+            results.append([[value] if value else [] for value in column])
+        return results
+
+    def append_rows(self, rows):
+        self.calls.append('append_rows')
+        self.values.extend(['' if value is None else str(value) for value in row] for row in rows)
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls.append(('batch_update', value_input_option, [d['range'] for d in data]))
+        for d in data:
+            row, col = a1_to_rowcol(d['range'].split(':')[0])
+            for offset, value in enumerate(d['values'][0]):
+                cells = self.values[row - 1]
+                cells.extend([''] * (col + offset - len(cells)))
+                cells[col + offset - 1] = value
+
+
+def sheet_with_jobs():
+    return FakeWorksheet([
+        HEADER,
+        ['1', 'PM', 'Acme', 'Bangalore', 'https://x/1', '2024-01-01', 'New', '', 'desc', '80%', ''],
+        ['2', 'PM', 'Beta', 'Pune', 'https://x/2', '2024-01-01', 'New', '', 'desc', '', ''],
+    ])
+
+
+def test_flush_merges_adjacent_cells_into_ranges():
+    sheet = sheet_with_jobs()
+    repo = SheetRepository(sheet).snapshot()
+    repo.queue_update(2, 7, 'Resume Ready')
+    repo.queue_update(3, 11, 'b.docx')
+    repo.queue_update(3, 10, '65%')
+    repo.queue_update(3, 7, 'Applied')
+    repo.queue_update(3, 7, 'Resume Ready')  # Later writes to a cell win
+
+    assert repo.flush() == 4
+    assert sheet.calls[-1] == ('batch_update', 'USER_ENTERED', ['G2', 'G3', 'J3:K3'])
+    assert sheet.values[2][6:11] == ['Resume Ready', '', 'desc', '65%', 'b.docx']
+    assert repo.flush() == 0
+    assert repo.api_calls == 2
+
+
+def test_snapshot_indexes_ids_and_links():
+    repo = SheetRepository(sheet_with_jobs()).snapshot()
+    assert repo.row_for('2') == 3
+    assert repo.contains(link='https://x/1')
+    assert [job.job_id for job in repo.job_records(status='new')] == ['1', '2']
+
+
+def test_saved_index_is_reused_while_the_sheet_matches(tmp_path):
+    path = str(tmp_path / 'index.json')
+    sheet = sheet_with_jobs()
+    SheetRepository(sheet).snapshot().save_index(path)
+
+    sheet.calls = []
+    repo = SheetRepository(sheet).ensure_index(path)
+    assert sheet.calls == ['batch_get']
+    assert repo.row_for('2') == 3
+    assert repo.contains(link='https://x/2')
+
+    sheet.values.append(['3', 'PM', 'Gamma', 'Delhi', 'https://x/3'])  # Added by someone else
+    assert not SheetRepository(sheet).load_index(path)
+
+
+def test_cell_reads_rows_missing_from_a_loaded_index(tmp_path):
+    path = str(tmp_path / 'index.json')
+    sheet = sheet_with_jobs()
+    SheetRepository(sheet).snapshot().save_index(path)
+
+    repo = SheetRepository(sheet).ensure_index(path)
+    assert repo.cell(2, 10) == '80%'  # Not treated as empty just because rows weren't downloaded
+    assert repo.cell(2, 11) == ''
+    assert sheet.calls.count('row_values') == 1
+    repo.queue_update(2, 11, 'a.docx')
+    assert repo.cell(2, 11) == 'a.docx'
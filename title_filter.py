@@ -0,0 +1,84 @@
+"""
+Compiled job-title classifier for the LinkedIn job tracker
+Word-boundary include/exclude rules, compiled once, with per-rule hit counters
+"""
+
+import re
+import threading
+from collections import Counter
+
+# Product management roles (matched as whole words, case-insensitive, plural allowed)
+DEFAULT_INCLUDE = [
+    'product manager',
+    'product management',
+    'product owner',
+    'product lead',
+    'group product manager',
+    'senior product manager',
+    'principal product manager',
+    'associate product manager',
+    'apm',
+    'gpm',
+    'spm',
+    'head of product',
+    'director of product',
+    'vp product',
+    'chief product officer',
+]
+
+# Titles rejected even when an include rule matches
+DEFAULT_EXCLUDE = []
+
+
+def _normalize(phrase):
+    return ' '.join(phrase.lower().split())
+
+
+def _compile(phrases):
+    """One alternation, longest phrase first, with flexible whitespace and an optional plural 's'"""
+    if not phrases:
+        return None
+    alternatives = [
+        r'\s+'.join(re.escape(word) for word in phrase.split())
+        for phrase in sorted(set(phrases), key=len, reverse=True)
+    ]
+    return re.compile(r'\b(' + '|'.join(alternatives) + r')s?\b', re.IGNORECASE)
+
+
+class TitleClassifier:
+    """
+    Accepts a title when an include rule matches it as a whole word (so 'apm'
+    no longer hits inside unrelated words) and no exclude rule does.
+    Counts hits per rule plus accepted/rejected totals in self.hits.
+    """
+    def __init__(self, include=None, exclude=None):
+        self.include = [_normalize(p) for p in (DEFAULT_INCLUDE if include is None else include)]
+        self.exclude = [_normalize(p) for p in (DEFAULT_EXCLUDE if exclude is None else exclude)]
+        self._include_re = _compile(self.include)
+        self._exclude_re = _compile(self.exclude)
+        self.hits = Counter()
+        self._lock = threading.Lock()
+
+    def matches(self, title, count=True):
+        """True if the title is a wanted role"""
+        include = self._include_re.search(title or '') if self._include_re else None
+        exclude = self._exclude_re.search(title) if include and self._exclude_re else None
+        accepted = include is not None and exclude is None
+        if count:
+            with self._lock:
+                if include:
+                    self.hits['include: ' + _normalize(include.group(1))] += 1
+                if exclude:
+                    self.hits['exclude: ' + _normalize(exclude.group(1))] += 1
+                self.hits['accepted' if accepted else 'rejected'] += 1
+        return accepted
+
+    __call__ = matches
+
+    def summary(self):
+        """One-line summary of accepted/rejected titles and the busiest rules"""
+        rules = [(rule, n) for rule, n in self.hits.most_common() if ':' in rule][:5]
+        line = f"🎯 Title filter: {self.hits['accepted']} accepted, {self.hits['rejected']} rejected"
+        if rules:
+            line += " (" + ", ".join(f"{rule} ×{n}" for rule, n in rules) + ")"
+        return line